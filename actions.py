@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ActionRunner:
+    """Bounded background thread pool for work that shouldn't block a Streamlit script thread"""
+
+    def __init__(self, max_workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="oah-action")
+
+    def submit(self, fn, *args, **kwargs):
+        return self._pool.submit(fn, *args, **kwargs)
+
+
+class PendingActions:
+    """Per-session list of submitted actions whose completion callbacks still have to run"""
+
+    def __init__(self):
+        self._pending = []
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, label, future, on_done=None):
+        self._pending.append((label, future, on_done))
+
+    def drain(self, on_error):
+        """Run callbacks for finished actions on the caller's (script) thread"""
+        still_running = []
+        for label, future, on_done in self._pending:
+            if not future.done():
+                still_running.append((label, future, on_done))
+            elif future.exception() is not None:
+                on_error(label, future.exception())
+            elif on_done is not None:
+                on_done(future.result())
+        self._pending = still_running
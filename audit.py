@@ -0,0 +1,149 @@
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+AUDIT_COLUMNS = ["Timestamp", "Action", "Detail", "Status"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def partition(ts):
+    """Table holding a millisecond timestamp: one per calendar month, e.g. audit_202410"""
+    return datetime.fromtimestamp(ts / 1000).strftime("audit_%Y%m")
+
+
+class AuditLog:
+    """Append-only audit trail in SQLite, partitioned into one table per month, indexed by (user, ts) and ts.
+
+    record() only queues the entry; a background thread writes whatever has queued up every
+    `flush_interval` seconds in one transaction, so logging adds no latency to the action itself.
+    page() walks the partitions newest first with a keyset cursor and stops once the page is full,
+    so reading a page costs the same however long the log grows, and old months leave as whole tables.
+    """
+
+    def __init__(self, path, flush_interval=0.2, batch_size=1000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._thread = None
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._partitions = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'audit_%'")
+        }
+
+    def _conn(self):
+        # One connection per thread; WAL lets pages be read while the writer appends
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, user, action, detail="", status="Success"):
+        self._queue.put((time.time_ns() // 1_000_000, user, action, detail, status))
+
+    def _write(self, entries):
+        conn = self._conn()
+        tables = {}
+        for entry in entries:
+            tables.setdefault(partition(entry[0]), []).append(entry)
+        with conn:
+            for table, rows in tables.items():
+                if table not in self._partitions:
+                    conn.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            id INTEGER PRIMARY KEY,
+                            ts INTEGER NOT NULL,
+                            user TEXT NOT NULL,
+                            action TEXT NOT NULL,
+                            detail TEXT NOT NULL,
+                            status TEXT NOT NULL
+                        )""")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_user_ts ON {table}(user, ts)")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_ts ON {table}(ts)")
+                conn.executemany(f"INSERT INTO {table} (ts, user, action, detail, status) VALUES (?, ?, ?, ?, ?)", rows)
+        self._partitions = self._partitions | tables.keys()  # Replaced, not mutated, so readers can iterate it
+
+    def _run(self):
+        entries = []  # Kept across a failed write and retried with the next batch
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(items) < self.batch_size and isinstance(items[-1], tuple):
+                try:
+                    items.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            entries.extend(item for item in items if isinstance(item, tuple))
+            if entries:
+                try:
+                    self._write(entries)
+                    entries = []
+                except sqlite3.Error:
+                    time.sleep(self.flush_interval)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if None in items:
+                return
+
+    def start(self):
+        """Start the background writer"""
+        self._thread = threading.Thread(target=self._run, name="oah-audit", daemon=True)
+        self._thread.start()
+        return self
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far has been written"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def page(self, user=None, cursor=None, limit=25, since=None, until=None):
+        """(newest-first rows, cursor of the next page or None) for one user (or everyone), between
+        the optional since/until datetimes; pass the returned cursor back to get the following page"""
+        bounds = []
+        if since is not None:
+            bounds.append(("ts >= ?", int(since.timestamp() * 1000)))
+        if until is not None:
+            bounds.append(("ts < ?", int(until.timestamp() * 1000)))
+        first = partition(bounds[0][1]) if since is not None else ""
+        last = partition(cursor[0]) if cursor else partition(bounds[-1][1]) if until is not None else "audit_~"
+        rows = []
+        for table in sorted(self._partitions, reverse=True):
+            if table > last:
+                continue
+            if table < first:
+                break
+            clauses, params = [], []
+            if user is not None:
+                clauses.append("user = ?")
+                params.append(user)
+            for clause, value in bounds:
+                clauses.append(clause)
+                params.append(value)
+            if cursor:
+                clauses.append("(ts < ? OR (ts = ? AND id < ?))")
+                params.extend([cursor[0], cursor[0], cursor[1]])
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            rows.extend(self._conn().execute(
+                f"SELECT ts, id, action, detail, status FROM {table} {where} ORDER BY ts DESC, id DESC LIMIT ?",
+                params + [limit + 1 - len(rows)]
+            ).fetchall())
+            if len(rows) > limit:
+                break
+        next_cursor = rows[limit - 1][:2] if len(rows) > limit else None
+        return [
+            dict(zip(AUDIT_COLUMNS, (datetime.fromtimestamp(ts / 1000).strftime(TIMESTAMP_FORMAT), action, detail, status)))
+            for ts, _, action, detail, status in rows[:limit]
+        ], next_cursor
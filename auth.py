@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        role TEXT NOT NULL,
+        salt BLOB NOT NULL,
+        hash BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+"""
+
+# scrypt cost: 16 MiB of memory and a few tens of milliseconds per hash
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1, "maxmem": 64 * 1024 * 1024, "dklen": 32}
+SALT_BYTES = 16
+
+
+def hash_password(password, salt):
+    return hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+
+
+class UserStore:
+    """SQLite user table with salted scrypt password hashes.
+
+    scrypt is slow and memory-hard on purpose, so hashing runs on a small thread pool (it releases the
+    GIL): a login storm queues there instead of running one hash per script thread at once, and
+    verify()/add() return Futures.
+    """
+
+    def __init__(self, path, workers=4):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oah-auth")
+        self._dummy_salt = os.urandom(SALT_BYTES)  # Unknown usernames still cost one hash
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, username):
+        """{"username", "name", "role"} or None"""
+        row = self._conn().execute(
+            "SELECT username, name, role FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return dict(zip(("username", "name", "role"), row)) if row else None
+
+    def _store(self, username, password, name=None, role=None):
+        salt = os.urandom(SALT_BYTES)
+        digest = hash_password(password, salt)
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                if name is None:
+                    conn.execute("UPDATE users SET salt = ?, hash = ? WHERE username = ?", (salt, digest, username))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)",
+                                 (username, name, role, salt, digest))
+
+    def add(self, username, password, name, role):
+        return self._pool.submit(self._store, username, password, name, role)
+
+    def set_password(self, username, password):
+        return self._pool.submit(self._store, username, password)
+
+    def seed(self, users, password):
+        """Add any of {username: {"name", "role"}} that are missing, all with the same password"""
+        existing = {row[0] for row in self._conn().execute("SELECT username FROM users")}
+        futures = [self.add(username, password, user["name"], user["role"])
+                   for username, user in users.items() if username not in existing]
+        for future in futures:
+            future.result()
+
+    def _verify(self, username, password):
+        row = self._conn().execute(
+            "SELECT name, role, salt, hash FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        salt, expected = (row[2], row[3]) if row else (self._dummy_salt, b"")
+        digest = hash_password(password, salt)
+        if row and hmac.compare_digest(digest, expected):
+            return {"username": username, "name": row[0], "role": row[1]}
+        return None
+
+    def verify(self, username, password):
+        """Future of the user ({"username", "name", "role"}), or of None if the credentials are wrong"""
+        return self._pool.submit(self._verify, username, password)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SessionTokens:
+    """HMAC-signed session tokens carrying the user and an expiry time.
+
+    Checking a token costs one HMAC rather than a password hash, and tokens already checked are kept in
+    a bounded LRU until they expire, so re-checking a signed-in session on every rerun is a dict lookup.
+    Tokens signed with a per-process secret stop working when the process restarts.
+    """
+
+    def __init__(self, secret=None, ttl=12 * 3600, max_cached=100_000):
+        self._secret = secret or os.urandom(32)
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self._valid = OrderedDict()  # Token -> user, for tokens that passed the signature check
+        self._revoked = {}  # Token -> expiry, until it would have expired anyway
+        self._lock = threading.Lock()
+
+    def _sign(self, payload):
+        return _b64(hmac.new(self._secret, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, user):
+        claims = dict(user, exp=int(time.time()) + self.ttl)
+        payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{payload}.{self._sign(payload)}"
+
+    def validate(self, token):
+        """The token's user ({"username", "name", "role"}), or None if it is forged, expired or revoked"""
+        if not token:
+            return None
+        now = time.time()
+        with self._lock:
+            user = self._valid.get(token)
+            if user is not None:
+                if user["exp"] > now:
+                    self._valid.move_to_end(token)
+                    return user
+                del self._valid[token]
+                return None
+            if token in self._revoked:
+                return None
+        payload, _, signature = token.partition(".")
+        if not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            return None
+        try:
+            user = json.loads(_unb64(payload))
+        except ValueError:
+            return None
+        if user.get("exp", 0) <= now:
+            return None
+        with self._lock:
+            if token in self._revoked:  # Revoked while its signature was being checked
+                return None
+            self._valid[token] = user
+            while len(self._valid) > self.max_cached:
+                self._valid.popitem(last=False)
+        return user
+
+    def revoke(self, token):
+        now = time.time()
+        user = self.validate(token)
+        with self._lock:
+            self._valid.pop(token, None)
+            if user is not None:
+                self._revoked[token] = user["exp"]
+            for expired in [t for t, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[expired]
@@ -0,0 +1,195 @@
+"""Benchmark app.py render and data paths with Streamlit's AppTest.
+
+Usage:
+    python bench.py                              # 1k / 100k / 1M rows, all roles
+    python bench.py --sizes 1000 --runs 5        # quick check
+    python bench.py --save baseline.json         # record a baseline
+    python bench.py --baseline baseline.json     # compare against it (exit 1 on regression)
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+from streamlit.testing.v1 import AppTest
+
+import export
+import synthetic
+from records import Donation
+from shared import SharedRecords
+from stats import DonationStats
+from store import RequestStore
+
+APP_PATH = str(Path(__file__).with_name("app.py"))
+ROLES = {"Resident": "resident", "Volunteer": "volunteer", "Admin": "admin"}
+PASSWORD = "pass123"
+
+
+class DataFrameCounter:
+    """Counts DataFrame constructions while active (AppTest runs the script in-process)"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = pd.DataFrame.__init__
+
+    def __enter__(self):
+        counter = self
+
+        def counting_init(frame, *args, **kwargs):
+            counter.count += 1
+            counter._original(frame, *args, **kwargs)
+
+        pd.DataFrame.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        pd.DataFrame.__init__ = self._original
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].message}")
+    return elapsed
+
+
+def bench_role(username, runs, timeout):
+    """Log in as username, then time warm reruns of every tab; returns the metrics for one role"""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    cold = timed_run(at)
+    at.text_input[0].input(username)
+    at.text_input[1].input(PASSWORD)
+    at.button[0].click()
+    login = timed_run(at)
+    while not at.session_state["logged_in"]:
+        # The password hash runs off the script thread; the login page polls it on later reruns
+        if login > timeout:
+            raise RuntimeError(f"login as {username} did not finish")
+        login += timed_run(at)
+
+    warm, tab_s = [], {}
+    tracemalloc.start()
+    with DataFrameCounter() as frames:
+        for label in [tab.label for tab in at.tabs]:
+            samples = []
+            for _ in range(runs):
+                # Only the selected tab renders and AppTest can't click tabs, so select it through its widget state
+                at.session_state["main_tab"] = label
+                warm.append(timed_run(at))
+                samples.append(at.session_state["tab_timings"].get(label, 0.0))
+            tab_s[label] = statistics.median(samples)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "cold_run_s": cold,
+        "login_run_s": login,
+        "rerun_median_s": statistics.median(warm),
+        "rerun_max_s": max(warm),
+        "peak_memory_mb": peak / 1024 / 1024,
+        "dataframes_per_run": frames.count / len(warm),
+        "tab_s": tab_s,
+    }
+
+
+def check_exports():
+    """Run every download callable through the conversion st.download_button applies on click;
+    returns {"<table> <format>": bytes written}"""
+    store = RequestStore(os.environ["OAH_DB_PATH"])
+    donations = SharedRecords(["Donor", "Campaign"], DonationStats(), Donation)
+    donations.extend(synthetic.donation_records(100))
+    sizes = {}
+    for fmt in export.EXPORT_FORMATS:
+        for table, download in (("requests", export.requests_export(store, fmt)),
+                                ("donations", export.donations_export(donations.snapshot(), fmt))):
+            data, _ = convert_data_to_bytes_and_infer_mime(
+                download(), RuntimeError(f"{table} {fmt} export returned a type st.download_button can't send")
+            )
+            if not data:
+                raise RuntimeError(f"{table} {fmt} export is empty")
+            sizes[f"{table} {fmt}"] = len(data)
+    return sizes
+
+
+def bench_size(size, runs, timeout):
+    """Seed a fresh database with size requests/donations and benchmark every role"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OAH_DB_PATH"] = os.path.join(tmp, "bench.db")
+        os.environ["OAH_JOURNAL_DIR"] = os.path.join(tmp, "journal")  # Else donations replay from an earlier size
+        os.environ["OAH_AUDIT_PATH"] = os.path.join(tmp, "audit.db")
+        os.environ["OAH_SEED_REQUESTS"] = str(size)
+        os.environ["OAH_SEED_DONATIONS"] = str(size)
+        os.environ["OAH_SEED_NOTIFICATIONS"] = str(min(size, 200))  # A full notification ring per user
+        # Shared resources (store, indexes, caches) must not leak between sizes
+        st.cache_resource.clear()
+        st.cache_data.clear()
+        for role, username in ROLES.items():
+            results[role] = bench_role(username, runs, timeout)
+            print(f"  {size:>9,} rows  {role:<9} rerun {results[role]['rerun_median_s'] * 1000:8.1f} ms  "
+                  f"peak {results[role]['peak_memory_mb']:7.1f} MB  "
+                  f"frames/run {results[role]['dataframes_per_run']:6.1f}", flush=True)
+        exports = check_exports()
+        print(f"  {size:>9,} rows  exports ok: " + ", ".join(f"{k} {v / 1024:,.0f} KB" for k, v in exports.items()),
+              flush=True)
+        st.cache_resource.clear()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print per-metric changes against the baseline; returns True if any timing regressed"""
+    regressed = False
+    for size, roles in results.items():
+        for role, metrics in roles.items():
+            old = baseline.get(size, {}).get(role)
+            if not old:
+                continue
+            for key in ("rerun_median_s", "peak_memory_mb", "dataframes_per_run"):
+                before, after = old[key], metrics[key]
+                change = (after - before) / before * 100 if before else 0.0
+                flag = ""
+                if change > tolerance:
+                    flag = "  <-- regression"
+                    regressed = True
+                print(f"  {size:>9} {role:<9} {key:<20} {before:10.3f} -> {after:10.3f} ({change:+6.1f}%){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=3, help="warm reruns per tab")
+    parser.add_argument("--timeout", type=float, default=600, help="AppTest timeout per script run (s)")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a saved JSON result")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size:,} rows...", flush=True)
+        results[str(size)] = bench_size(size, args.runs, args.timeout)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+        print(f"Saved results to {args.save}")
+    if args.baseline:
+        print(f"Comparing against {args.baseline}:")
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
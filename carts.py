@@ -0,0 +1,187 @@
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import NamedTuple
+
+CART_SET = "cart_set"
+CHECKOUT = "checkout"
+ORDER = "order"  # Placed orders as written by journal snapshots
+
+
+class CartLine(NamedTuple):
+    sku: str
+    name: str
+    price: int
+    qty: int
+
+    @property
+    def subtotal(self):
+        return self.price * self.qty
+
+
+class Cart:
+    """One user's cart keyed by SKU; item count and total are kept up to date on every change"""
+
+    def __init__(self):
+        self.lines = {}  # SKU -> CartLine, in the order they were first added
+        self.count = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    def set(self, sku, name, price, qty):
+        old = self.lines.get(sku)
+        if old is not None:
+            self.count -= old.qty
+            self.total -= old.subtotal
+        if qty > 0:
+            line = self.lines[sku] = CartLine(sku, name, price, qty)
+            self.count += line.qty
+            self.total += line.subtotal
+        elif old is not None:
+            del self.lines[sku]
+
+    def rows(self):
+        """Lines as display dicts"""
+        return [{"SKU": l.sku, "Item": l.name, "Price": l.price, "Qty": l.qty, "Total": l.subtotal}
+                for l in self.lines.values()]
+
+
+class CartStore:
+    """Per-user carts and placed orders, persisted through a Journal and shared by a user's sessions.
+
+    Cart changes are journaled as the line's new quantity, so replaying them is idempotent. Checkouts
+    go through a queue: a background thread journals whatever orders have arrived as one batch, with
+    one fsync, and applies each one (the order is stored and its items leave the cart) atomically.
+    """
+
+    KINDS = (CART_SET, CHECKOUT, ORDER)
+
+    def __init__(self, journal, order_ids, batch_size=100):
+        self.journal = journal
+        self.order_ids = order_ids
+        self.batch_size = batch_size
+        self.orders = []  # Placed orders, oldest first
+        self._carts = {}
+        self._pending = set()  # Users with a checkout in the queue
+        self._lock = threading.Lock()
+        self._writes = threading.Lock()  # Serializes read-modify-write quantity changes
+        self._queue = None
+        self.version = 0
+
+    def cart(self, user):
+        """The user's cart; read it, but change it through add() and set_quantity()"""
+        with self._lock:
+            return self._carts.setdefault(user, Cart())
+
+    def apply(self, kind, data):
+        """Apply one journaled change (on replay, or under the journal lock when it is recorded)"""
+        with self._lock:
+            if kind == CART_SET:
+                self._carts.setdefault(data["user"], Cart()).set(data["sku"], data["name"], data["price"], data["qty"])
+            elif kind in (CHECKOUT, ORDER):
+                self.orders.append(data)
+            if kind == CHECKOUT:
+                cart = self._carts.setdefault(data["User"], Cart())
+                for item in data["Items"]:
+                    line = cart.lines.get(item["SKU"])
+                    if line is not None:
+                        cart.set(line.sku, line.name, line.price, line.qty - item["Qty"])
+            self.version += 1
+
+    def _set(self, user, sku, name, price, qty):
+        data = {"user": user, "sku": sku, "name": name, "price": price, "qty": max(qty, 0)}
+        self.journal.record(CART_SET, data, apply=lambda: self.apply(CART_SET, data))
+
+    def add(self, user, product, qty=1):
+        """Add a catalog product, merging with the line already in the cart"""
+        with self._writes:
+            line = self.cart(user).lines.get(product.sku)
+            self._set(user, product.sku, product.name, product.price, (line.qty if line else 0) + qty)
+
+    def set_quantity(self, user, sku, qty):
+        """Change a line's quantity; 0 removes it"""
+        with self._writes:
+            line = self.cart(user).lines.get(sku)
+            if line is not None:
+                self._set(user, sku, line.name, line.price, qty)
+
+    def checkout(self, user):
+        """Queue the user's cart as an order; returns a Future of the placed order, or None if there is
+        nothing to check out or a checkout of theirs is still in flight"""
+        with self._lock:
+            cart = self._carts.get(user)
+            if not cart or user in self._pending:
+                return None
+            self._pending.add(user)
+            order = {
+                "ID": self.order_ids.next_id(),
+                "User": user,
+                "Items": [{"SKU": l.sku, "Item": l.name, "Price": l.price, "Qty": l.qty} for l in cart.lines.values()],
+                "Total": cart.total,
+                "Placed": datetime.now().isoformat(timespec="seconds"),
+            }
+        future = Future()
+        self._queue.put((order, future))
+        return future
+
+    def pending(self, user):
+        return user in self._pending
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                return
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            placed = [order for order, _ in batch]
+
+            def apply():
+                for order in placed:
+                    self.apply(CHECKOUT, order)
+            error = None
+            try:
+                self.journal.record_many(CHECKOUT, placed, apply=apply, sync=True)
+            except Exception as exc:
+                error = exc
+            with self._lock:
+                self._pending.difference_update(order["User"] for order in placed)
+            for order, future in batch:
+                if error is None:
+                    future.set_result(order)
+                else:
+                    future.set_exception(error)
+            if stop:
+                return
+
+    def start(self):
+        """Start the checkout batching thread"""
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="oah-checkout", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._queue is not None:
+            self._queue.put(None)
+
+    def entries(self):
+        """Journal entries that rebuild the current state; copies it now, for Journal snapshot captures"""
+        with self._lock:
+            orders = list(self.orders)
+            lines = [(user, list(cart.lines.values())) for user, cart in self._carts.items()]
+
+        def replay():
+            for order in orders:
+                yield ORDER, order
+            for user, cart_lines in lines:
+                for line in cart_lines:
+                    yield CART_SET, {"user": user, "sku": line.sku, "name": line.name, "price": line.price, "qty": line.qty}
+        return replay()
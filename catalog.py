@@ -0,0 +1,120 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+import pandas as pd
+from search import SearchIndex
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow, product images are served at their original size
+    Image = None
+
+CATALOG_COLUMNS = ["SKU", "Name", "Category", "Price", "Image"]
+
+
+class Product(NamedTuple):
+    sku: str
+    name: str
+    category: str
+    price: int
+    image: str = ""  # Local path or URL; empty when the product has no picture
+
+
+DEFAULT_PRODUCTS = [
+    Product("HC-001", "Adult Diapers (Pack of 10)", "🏥 Healthcare", 899),
+    Product("HC-002", "Blood Pressure Monitor", "🏥 Healthcare", 1299),
+    Product("HC-003", "Walking Stick", "🏥 Healthcare", 499),
+    Product("HC-004", "Medicine Organizer", "🏥 Healthcare", 299),
+    Product("GR-001", "Fresh Fruits (1kg)", "🍎 Groceries", 120),
+    Product("GR-002", "Milk (1L)", "🍎 Groceries", 60),
+    Product("GR-003", "Whole Wheat Bread", "🍎 Groceries", 45),
+    Product("GR-004", "Eggs (12 pcs)", "🍎 Groceries", 84),
+    Product("LE-001", "Large Print Books", "📚 Leisure", 299),
+    Product("LE-002", "Puzzle Games", "📚 Leisure", 199),
+    Product("LE-003", "Reading Glasses", "📚 Leisure", 499),
+]
+
+
+class Catalog:
+    """Read-only product catalog, loaded once, with its category lists and search index built up front"""
+
+    def __init__(self, products):
+        self.products = {p.sku: p for p in products}
+        self.categories = {}  # Category -> SKUs in catalog order
+        for product in self.products.values():
+            self.categories.setdefault(product.category, []).append(product.sku)
+        self._all = list(self.products)
+        self.index = SearchIndex(["Name", "Category"])
+        self.index.add_many((p.sku, {"Name": p.name, "Category": p.category}) for p in self.products.values())
+
+    def __len__(self):
+        return len(self.products)
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a supplier catalog (CATALOG_COLUMNS; Image optional, relative to the file)"""
+        df = pd.read_csv(path, dtype={"SKU": str, "Name": str, "Category": str, "Image": str})
+        images = df["Image"].fillna("") if "Image" in df else pd.Series("", index=df.index)
+        base = os.path.dirname(os.path.abspath(path))
+        images = [
+            image if not image or "://" in image else os.path.join(base, image)
+            for image in images.tolist()
+        ]
+        return cls(Product(*row) for row in zip(
+            df["SKU"].tolist(), df["Name"].tolist(), df["Category"].tolist(),
+            df["Price"].astype(int).tolist(), images
+        ))
+
+    def get(self, sku):
+        return self.products.get(sku)
+
+    def page(self, category=None, skus=None, offset=0, limit=12):
+        """(products from offset, total) in catalog order, optionally one category and/or a SKU set (search hits)"""
+        order = self.categories.get(category, []) if category else self._all
+        if skus is not None:
+            order = [sku for sku in order if sku in skus]
+        return [self.products[sku] for sku in order[offset:offset + limit]], len(order)
+
+
+class ThumbnailCache:
+    """LRU of product thumbnails (PNG bytes) bounded by total size, so each image is decoded and resized once"""
+
+    def __init__(self, size=(240, 240), max_bytes=16 * 1024 * 1024):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _build(self, path):
+        if Image is None:
+            with open(path, "rb") as f:
+                return f.read()
+        with Image.open(path) as image:
+            image.thumbnail(self.size)
+            out = io.BytesIO()
+            image.save(out, format="PNG")
+            return out.getvalue()
+
+    def get(self, image):
+        """Thumbnail bytes for a local image path; URLs are returned as-is for the browser to load"""
+        if not image or "://" in image:
+            return image or None
+        with self._lock:
+            if image in self._entries:
+                self._entries.move_to_end(image)
+                return self._entries[image]
+        try:
+            data = self._build(image)
+        except OSError:
+            return None
+        with self._lock:
+            if image not in self._entries:
+                self._entries[image] = data
+                self._bytes += len(data)
+            while self._entries and self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return data
@@ -0,0 +1,137 @@
+import itertools
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+BASE_LAYOUT = dict(
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color='#2d3748', size=12, family='Inter')
+)
+
+STATUS_COLORS = {
+    'Pending': '#FF9800',
+    'In Progress': '#2196F3',
+    'Completed': '#4CAF50',
+    'Cancelled': '#9E9E9E'
+}
+
+CAMPAIGN_COLORS = ['#667eea', '#764ba2', '#f093fb', '#4facfe']
+
+URGENCY_COLORS = {
+    'Low': '#4CAF50',
+    'Medium': '#FF9800',
+    'High': '#F44336',
+    'Urgent': '#D32F2F'
+}
+
+
+# Serialized figure size is about the template plus a few bytes per data point (measured with to_json())
+FIGURE_BASE_BYTES = 8 * 1024
+POINT_BYTES = 16
+DATA_ARRAYS = ("x", "y", "labels", "values")
+
+
+def estimated_bytes(fig):
+    """Rough serialized size of a figure from its data point count, without serializing it"""
+    points = sum(
+        len(trace[attr]) for trace in fig.data for attr in DATA_ARRAYS
+        if attr in trace and trace[attr] is not None
+    )
+    return FIGURE_BASE_BYTES + POINT_BYTES * points
+
+
+class FigureCache:
+    """LRU cache of built Plotly figures keyed by (chart, data version, params), bounded by count and estimated bytes.
+
+    st.plotly_chart() serializes whatever it is given, so entries are sized by estimated_bytes()
+    rather than by serializing every new figure a second time.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, builder, *args, **kwargs):
+        """Return the cached figure for key, building it with builder(*args) on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        fig = builder(*args, **kwargs)
+        size = estimated_bytes(fig)
+        with self._lock:
+            self.misses += 1
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (fig, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return fig
+
+
+# Figure Builders (take pre-aggregated data, never the raw record lists)
+def donation_trend_figure(series, grain, height=300):
+    """Stacked per-campaign amounts from DonationStats.series(); one bar per rollup bucket"""
+    buckets = [bucket for bucket, _, _ in series]
+    campaigns = sorted({campaign for _, sums, _ in series for campaign in sums})
+    fig = go.Figure()
+    for color, campaign in zip(itertools.cycle(CAMPAIGN_COLORS), campaigns):
+        fig.add_trace(go.Bar(
+            x=buckets,
+            y=[sums.get(campaign, 0) for _, sums, _ in series],
+            name=campaign,
+            marker_color=color
+        ))
+    fig.update_layout(**BASE_LAYOUT, barmode='stack', xaxis_title=grain.capitalize(), yaxis_title="Amount (₹)", height=height)
+    return fig
+
+
+def campaign_figure(by_campaign, height=300):
+    campaign_totals = pd.DataFrame(sorted(by_campaign.items()), columns=['Campaign', 'Amount'])
+    fig = px.pie(
+        campaign_totals,
+        values='Amount',
+        names='Campaign',
+        color_discrete_sequence=CAMPAIGN_COLORS
+    )
+    fig.update_layout(**BASE_LAYOUT, height=height)
+    return fig
+
+
+def status_figure(by_status, height=300):
+    status_df = pd.DataFrame(by_status.most_common(), columns=['Status', 'Count'])
+    fig = px.bar(status_df, x='Status', y='Count', color='Status', color_discrete_map=STATUS_COLORS)
+    fig.update_layout(**BASE_LAYOUT, showlegend=False, height=height)
+    return fig
+
+
+def urgency_figure(by_urgency, height=300):
+    urgency_counts = pd.DataFrame(by_urgency.most_common(), columns=['Urgency', 'Count'])
+    fig = px.pie(urgency_counts, values='Count', names='Urgency', color='Urgency', color_discrete_map=URGENCY_COLORS)
+    fig.update_layout(**BASE_LAYOUT, height=height)
+    return fig
+
+
+def service_type_figure(by_type, top=10, height=400):
+    service_counts = pd.DataFrame(by_type.most_common(top), columns=['Service Type', 'Count'])
+    fig = px.bar(
+        service_counts,
+        x='Count',
+        y='Service Type',
+        orientation='h',
+        color='Count',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(**BASE_LAYOUT, height=height, showlegend=False)
+    return fig
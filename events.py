@@ -0,0 +1,115 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import suppress
+from typing import NamedTuple
+
+REQUEST_CREATED = "request_created"
+TASK_ACCEPTED = "task_accepted"
+DONATION_RECEIVED = "donation_received"
+
+
+class Event(NamedTuple):
+    seq: int
+    topic: str
+    payload: dict
+    origin: str  # Publishing session, so it can skip its own events
+    time: float
+    remote: bool = False  # Relayed from another process
+
+
+class EventBus:
+    """In-process pub/sub with a bounded history, so sessions can poll for what they missed by cursor"""
+
+    def __init__(self, history=1000):
+        self._events = deque(maxlen=history)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.cursor = 0  # seq of the newest event
+
+    def publish(self, topic, payload, origin=None, remote=False):
+        with self._lock:
+            self.cursor += 1
+            event = Event(self.cursor, topic, payload, origin, time.time(), remote)
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+        for fn in subscribers:
+            fn(event)
+        return event.seq
+
+    def subscribe(self, fn):
+        """Call fn(event) on the publishing thread for every event; returns an unsubscribe callable"""
+        with self._lock:
+            self._subscribers.append(fn)
+        return lambda: self._subscribers.remove(fn)
+
+    def since(self, cursor, topics=None):
+        """(events after cursor oldest first, new cursor); O(1) when nothing new arrived"""
+        with self._lock:
+            latest = self.cursor
+            if cursor >= latest:
+                return [], latest
+            new = []
+            for event in reversed(self._events):
+                if event.seq <= cursor:
+                    break
+                new.append(event)
+        new.reverse()
+        return [e for e in new if topics is None or e.topic in topics], latest
+
+
+class SocketRelay:
+    """Optional local-socket backend that fans bus events out to the other app processes on this host.
+
+    Each process binds a Unix datagram socket in a shared directory, sends its own events to every
+    other socket there as JSON, and republishes what it receives on its local bus.
+    """
+
+    def __init__(self, bus, directory):
+        self.bus = bus
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._recv = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._recv.bind(self.path)
+        self._send = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send.setblocking(False)  # A slow peer drops events instead of stalling the publisher
+        threading.Thread(target=self._receive, name="oah-event-relay", daemon=True).start()
+        bus.subscribe(self._forward)
+
+    def _forward(self, event):
+        if event.remote:
+            return
+        data = json.dumps({"topic": event.topic, "payload": event.payload, "origin": event.origin}, default=str)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self.path or not name.endswith(".sock"):
+                continue
+            try:
+                self._send.sendto(data.encode("utf-8"), path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a process that has exited
+                with suppress(OSError):
+                    os.unlink(path)
+            except BlockingIOError:
+                pass
+
+    def _receive(self):
+        while True:
+            try:
+                message = json.loads(self._recv.recv(65536))
+            except OSError:
+                return
+            except ValueError:
+                continue
+            self.bus.publish(message["topic"], message["payload"], message["origin"], remote=True)
+
+    def close(self):
+        self._recv.close()
+        self._send.close()
+        with suppress(OSError):
+            os.unlink(self.path)
@@ -0,0 +1,85 @@
+import gzip
+import itertools
+import os
+import tempfile
+import pandas as pd
+from records import DONATION_COLUMNS
+from store import REQUEST_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is only offered when pyarrow is installed
+    pa = pq = None
+
+CHUNK_SIZE = 5000
+
+# Label -> (file extension, mime type); the first is the default. st.download_button reads the whole
+# finished file into memory to serve it, so the compressed formats come first: they bound what it holds
+EXPORT_FORMATS = {"CSV (gzip)": (".csv.gz", "application/gzip")}
+if pq is not None:
+    EXPORT_FORMATS["Parquet"] = (".parquet", "application/vnd.apache.parquet")
+EXPORT_FORMATS["CSV"] = (".csv", "text/csv")
+
+
+def write_export(chunks, fmt, columns):
+    """Stream DataFrame chunks into an anonymous temp file and return a read-only handle on it for download.
+
+    Building the export never holds more than a chunk, but st.download_button then reads the finished
+    file into one bytes object for its media file manager, so serving it costs the file's size in memory.
+    It also only takes plain readers (BufferedReader, not the temp file's BufferedRandom), so the file is
+    reopened read-only through a duplicate descriptor, which keeps it alive once the writable handle is closed.
+    """
+    out = tempfile.TemporaryFile()
+    if fmt == "Parquet":
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            writer = pq.ParquetWriter(out, pa.Table.from_pandas(pd.DataFrame(columns=columns)).schema)
+        writer.close()
+    else:
+        sink = gzip.GzipFile(fileobj=out, mode="wb") if fmt == "CSV (gzip)" else out
+        header = True
+        for chunk in chunks:
+            sink.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+            header = False
+        if header:
+            sink.write(pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8"))
+        if sink is not out:
+            sink.close()
+    out.flush()
+    reader = os.fdopen(os.dup(out.fileno()), "rb")
+    out.close()
+    reader.seek(0)
+    return reader
+
+
+def request_chunks(store, ids=None, chunk_size=CHUNK_SIZE, **filters):
+    """Yield filtered request DataFrames straight from the store, chunk_size rows at a time"""
+    for rows in store.iter_chunks(chunk_size, **filters):
+        chunk = pd.DataFrame(rows, columns=list(REQUEST_COLUMNS))
+        if ids is not None:
+            chunk = chunk[chunk["ID"].isin(ids)]
+        if not chunk.empty:
+            yield chunk
+
+
+def donation_chunks(snapshot, seqs=None, chunk_size=CHUNK_SIZE):
+    """Yield donation DataFrames newest first from a shared snapshot, optionally limited to arrival seqs"""
+    rows = snapshot.newest(seqs)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        yield pd.DataFrame([donation.to_dict() for donation in chunk], columns=DONATION_COLUMNS)
+
+
+def requests_export(store, fmt, ids=None, **filters):
+    """Deferred download callable for the filtered request table"""
+    return lambda: write_export(request_chunks(store, ids, **filters), fmt, list(REQUEST_COLUMNS))
+
+
+def donations_export(snapshot, fmt, seqs=None):
+    """Deferred download callable for a donation snapshot"""
+    return lambda: write_export(donation_chunks(snapshot, seqs), fmt, DONATION_COLUMNS)
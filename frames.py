@@ -0,0 +1,274 @@
+import threading
+import numpy as np
+import pandas as pd
+from matching import URGENCY_RANK
+from records import DONATION_COLUMNS, to_rupees
+from store import REQUEST_COLUMNS
+
+CATEGORICAL_FIELDS = ["Type", "Urgency", "Status", "Volunteer", "Resident"]
+
+# Sort name -> (column, descending) pairs, most significant first; ID last makes every order total
+SORTS = {
+    "newest": (("Created", True), ("ID", True)),
+    "oldest": (("Created", False), ("ID", False)),
+    "urgency": (("Urgency", True), ("Created", False), ("Resident", False), ("ID", False)),
+}
+
+REORDER_LIMIT = 256  # Rows a refresh moves into place in a cached order one by one; more and it is re-sorted
+
+
+def _with_categories(col, values):
+    """A categorical column recoded onto the sorted union of its categories and values (codes keep sorting like the values)"""
+    missing = set(values).difference(col.cat.categories)
+    if not missing:
+        return col
+    return col.cat.set_categories(sorted([*col.cat.categories, *missing]))
+
+
+class RequestFrame:
+    """Columnar, categorical copy of the request store used for vectorized filtering.
+
+    After the first build, a refresh only appends the rows inserted since (by rowid) and re-reads the
+    rows updated since (from the store's update log) into a shallow copy, and cached sort orders have
+    just those rows moved into place, so a write costs about as much as it changed. The whole table is
+    reloaded only when the update log no longer reaches back that far.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._version = None
+        self._rowid = 0  # Last store rowid in the frame
+        self._positions = {}  # ID -> row; rows never move, so appends only add entries
+        self._sort_keys = {}  # Column -> integer array ordering rows like the column
+        self._orders = {}  # Sort name -> row permutation
+        self.df = None
+
+    def _refresh(self):
+        # Catch up only when the store has been written to since the last build
+        if self._version == self.store.version:
+            return
+        with self._lock:
+            version = self.store.version
+            if self._version == version:
+                return
+            updated = None if self.df is None else self.store.updated_since(self._version)
+            if updated is None:
+                self._rowid, rows = self.store.rows_after(0)
+                df = pd.DataFrame.from_records(rows, columns=list(REQUEST_COLUMNS))
+                for field in CATEGORICAL_FIELDS:
+                    df[field] = df[field].astype("category")
+                self._positions = {request_id: row for row, request_id in enumerate(df["ID"].tolist())}
+                self._sort_keys, self._orders = {}, {}
+                self.df, self._version = df, version
+                return
+            df, positions = self.df, self._positions
+            self._rowid, rows = self.store.rows_after(self._rowid)
+            appended = np.arange(len(df), len(df) + len(rows))
+            if rows:
+                positions.update((row[0], len(df) + i) for i, row in enumerate(rows))
+                df = self._append(df, rows)
+            changed, patched = set(), appended[:0]
+            if updated:
+                df, changed, patched = self._patch(df, positions, self.store.rows_for(updated))
+            # Frames are replaced, never changed in place, so a view handed out earlier stays consistent;
+            # each cached order only has the new rows, and rows whose sort columns changed, moved into place
+            orders = {}
+            for sort, order in self._orders.items():
+                moved = appended
+                if changed.intersection(column for column, _ in SORTS[sort]):
+                    moved = np.union1d(appended, patched)
+                if len(moved) <= REORDER_LIMIT:
+                    orders[sort] = self._reorder(df, sort, order, moved) if len(moved) else order
+            self._sort_keys = {} if rows else {column: key for column, key in self._sort_keys.items() if column not in changed}
+            self._orders = orders
+            self.df, self._version = df, version
+
+    @staticmethod
+    def _append(df, rows):
+        new = pd.DataFrame.from_records(rows, columns=list(REQUEST_COLUMNS))
+        df = df.copy(deep=False)
+        for field in CATEGORICAL_FIELDS:
+            df[field] = _with_categories(df[field], new[field])
+            new[field] = pd.Categorical(new[field], categories=df[field].cat.categories)
+        return pd.concat([df, new], ignore_index=True)
+
+    @staticmethod
+    def _patch(df, positions, rows):
+        """(shallow copy of df with rows overwritten, names of the columns that changed, their row positions);
+        only the changed columns are copied"""
+        patch = pd.DataFrame.from_records(rows, columns=list(REQUEST_COLUMNS))
+        at = np.array([positions.get(request_id, -1) for request_id in patch["ID"].tolist()], dtype=np.int64)
+        patch, at = patch[at >= 0], at[at >= 0]
+        df, changed = df.copy(deep=False), set()
+        for field in REQUEST_COLUMNS:
+            values = patch[field].to_numpy()
+            if (df[field].iloc[at].to_numpy() == values).all():
+                continue
+            changed.add(field)
+            if field in CATEGORICAL_FIELDS:
+                col = _with_categories(df[field], values)
+                codes = col.cat.codes.to_numpy().copy()
+                codes[at] = col.cat.categories.get_indexer(values)
+                col = pd.Categorical.from_codes(codes, col.cat.categories).remove_unused_categories()
+            else:
+                col = df[field].copy()
+                col.iloc[at] = values
+            df[field] = col
+        return df, changed, at
+
+    @staticmethod
+    def _reorder(df, sort, order, rows):
+        """order with rows (new or changed) taken out and binary-searched back in where they now sort"""
+        columns = [(df[column], column, descending) for column, descending in SORTS[sort]]
+
+        def key(row):
+            values = []
+            for col, column, _ in columns:
+                value = col.iat[row]
+                if column == "Urgency":
+                    value = URGENCY_RANK.get(value, -1)
+                elif column == "Created":
+                    value = np.datetime64(value, "s")
+                values.append(value)
+            return values
+
+        def before(a, b):
+            for x, y, (_, _, descending) in zip(a, b, columns):
+                if x != y:
+                    return x > y if descending else x < y
+            return False
+
+        order = order[~np.isin(order, rows)]
+        for row in rows.tolist():
+            target, lo, hi = key(row), 0, len(order)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if before(key(order[mid]), target):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            order = np.insert(order, lo, row)
+        return order
+
+    @staticmethod
+    def _sort_key(df, column, cache):
+        key = cache.get(column)
+        if key is None:
+            col = df[column]
+            if column == "Urgency":
+                # Ordinal, not alphabetical
+                ranks = np.array([URGENCY_RANK.get(c, -1) for c in col.cat.categories], dtype=np.int8)
+                key = ranks[col.cat.codes.to_numpy()]
+            elif column == "Created":
+                key = col.to_numpy(dtype=str).astype("datetime64[s]").astype(np.int64)
+            elif column in CATEGORICAL_FIELDS:
+                key = col.cat.codes.to_numpy()  # Categories are sorted, so codes sort like the values
+            else:
+                key = pd.factorize(col, sort=True)[0]
+            cache[column] = key
+        return key
+
+    def _order(self, df, sort):
+        """Row permutation of df for a named sort, computed once per store version"""
+        with self._lock:
+            # A rebuild may have swapped self.df since the caller read it; don't cache for a stale frame
+            sort_keys, orders = (self._sort_keys, self._orders) if df is self.df else ({}, {})
+            order = orders.get(sort)
+            if order is None:
+                # np.lexsort treats its last key as the most significant
+                keys = []
+                for column, descending in reversed(SORTS[sort]):
+                    key = self._sort_key(df, column, sort_keys)
+                    keys.append(-key.astype(np.int64) if descending else key)
+                order = orders[sort] = np.lexsort(keys)
+            return order
+
+    def categories(self, field):
+        """Sorted values present in a categorical column"""
+        self._refresh()
+        return sorted(self.df[field].cat.categories)
+
+    def filter(self, ids=None, sort=None, **filters):
+        """The rows of view() as a DataFrame"""
+        df, positions = self.view(ids, sort, **filters)
+        return df.iloc[positions]
+
+    def view(self, ids=None, sort=None, **filters):
+        """(frame, row positions) after every equality filter and an optional ID set (search hits), in a
+        single boolean-mask pass; the frame is shared by every view of this store version, not copied.
+
+        With a sort name from SORTS, positions come back in that order by walking the cached permutation
+        through the mask, so a filtered view is ordered in O(n) without sorting it again.
+        """
+        self._refresh()
+        df = self.df
+        if ids is None:
+            mask = np.ones(len(df), dtype=bool)
+        else:
+            mask = np.zeros(len(df), dtype=bool)
+            # IDs added by a refresh after df was read point past its end
+            positions = self._positions
+            rows = np.fromiter((positions.get(request_id, -1) for request_id in ids), dtype=np.int64)
+            mask[rows[(rows >= 0) & (rows < len(df))]] = True
+        for field, value in filters.items():
+            if value is None or value == "All":
+                continue
+            col = df[field]
+            if field in CATEGORICAL_FIELDS:
+                # Compare integer codes instead of strings
+                if value not in col.cat.categories:
+                    mask[:] = False
+                    continue
+                mask &= col.cat.codes.to_numpy() == col.cat.categories.get_loc(value)
+            else:
+                mask &= (col == value).to_numpy()
+        if sort:
+            order = self._order(df, sort)
+            return df, order[mask[order]]
+        return df, np.flatnonzero(mask)
+
+
+class DonationFrame:
+    """Columnar copy of the shared donations for paging, extended only by the rows appended since the last view.
+
+    Row i is arrival seq i, so search hits (seqs) are row positions too. The frame is replaced, never
+    changed in place, so views handed out earlier stay valid.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.df = pd.DataFrame(columns=[*DONATION_COLUMNS, "Seq"])
+        self._dates = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+
+    def _extend(self, snapshot):
+        start, end = len(self.df), len(snapshot)
+        records = [snapshot[seq] for seq in range(start, end)]
+        dates = np.array([r.date for r in records], dtype=np.int64)
+        stamps = np.datetime_as_string(dates.astype("datetime64[s]"), unit="m")
+        new = pd.DataFrame({
+            "Amount": [to_rupees(r.amount) for r in records],
+            "Donor": [r.donor for r in records],
+            "Date": np.char.replace(stamps, "T", " "),
+            "Campaign": [r.campaign for r in records],
+            "Seq": np.arange(start, end),
+        })
+        self.df = new if not start else pd.concat([self.df, new], ignore_index=True)
+        self._dates = np.concatenate([self._dates, dates])
+        # Newest first: by date, then by arrival
+        self._order = np.lexsort((-np.arange(end), -self._dates))
+
+    def view(self, snapshot, seqs=None):
+        """(frame, row positions) of a snapshot's donations newest first, optionally only arrival seqs in seqs"""
+        with self._lock:
+            if len(snapshot) > len(self.df):
+                self._extend(snapshot)
+            df, order = self.df, self._order
+        if len(df) > len(snapshot):
+            order = order[order < len(snapshot)]  # Rows appended after this snapshot was taken
+        if seqs is not None:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[[seq for seq in seqs if seq < len(snapshot)]] = True
+            order = order[mask[order]]
+        return df, order
@@ -0,0 +1,58 @@
+import itertools
+import time
+import numpy as np
+
+# Crockford base32: no I, L, O or U, and its characters sort in the same order as their values
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+WIDTH = 13  # 13 x 5 bits covers the 63-bit id
+EPOCH_MS = 1704067200000  # 2024-01-01 UTC; 41 bits of milliseconds lasts until 2093
+WORKER_BITS = 8
+SEQUENCE_BITS = 14
+WORKERS = 1 << WORKER_BITS
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+_DIGITS = np.array(list(ALPHABET))
+_SHIFTS = np.arange(5 * (WIDTH - 1), -1, -5, dtype=np.int64)
+
+
+def encode(value):
+    return "".join(ALPHABET[(value >> shift) & 31] for shift in range(5 * (WIDTH - 1), -1, -5))
+
+
+def pack(ms, worker, sequence):
+    return ((ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)) | (worker << SEQUENCE_BITS) | (sequence & SEQUENCE_MASK)
+
+
+class TimeOrderedIds:
+    """Snowflake-style ids: milliseconds, worker number, then a per-worker sequence, in fixed-width base32.
+
+    They sort by creation time as plain strings, so they work as the store's clustered key, and are
+    unique as long as every live process has its own worker number (RequestStore.claim_worker()) and
+    makes fewer than 16384 ids in one millisecond. Allocation takes no lock: the sequence is an
+    itertools.count, whose next() is atomic under the GIL.
+    """
+
+    def __init__(self, worker, prefix="REQ"):
+        self.worker = worker % WORKERS
+        self.prefix = prefix
+        self._sequence = itertools.count()
+
+    def next_id(self):
+        sequence = next(self._sequence)
+        return self.prefix + encode(pack(time.time_ns() // 1_000_000, self.worker, sequence))
+
+
+def ids_for_times(ms, worker, prefix="REQ"):
+    """Vectorized ids for a batch of (possibly historical) millisecond times, as a NumPy string array.
+
+    Sequence numbers count up within each millisecond of the batch, so the batch has no duplicates;
+    give each batch its own worker number.
+    """
+    ms = np.asarray(ms, dtype=np.int64)
+    order = np.argsort(ms, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(ms[order]) != 0])
+    ranks = np.empty(len(ms), dtype=np.int64)
+    ranks[order] = np.arange(len(ms)) - np.repeat(starts, np.diff(np.r_[starts, len(ms)]))
+    values = pack(ms, worker % WORKERS, ranks)
+    chars = _DIGITS[(values[:, None] >> _SHIFTS) & 31]
+    return np.char.add(prefix, chars.view(f"<U{WIDTH}").ravel())
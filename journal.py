@@ -0,0 +1,219 @@
+import glob
+import json
+import os
+import sys
+import threading
+import traceback
+from contextlib import suppress
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): nothing stops two processes sharing a directory, so don't
+    fcntl = None
+
+
+def _dumps(entry):
+    return json.dumps(entry, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _fsync_dir(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_lines(path):
+    """Decoded JSON lines of a file; a torn last write (a crash mid-append) is cut off the file"""
+    good = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if entry is None or not line.endswith(b"\n"):
+                break
+            good += len(line)
+            yield entry
+        else:
+            return
+    with open(path, "r+b") as f:
+        f.truncate(good)
+
+
+class Journal:
+    """Append-only JSON Lines journal of state changes, with batched fsync and compacted snapshots.
+
+    Every change is recorded as (kind, data) with a sequence number. Writes are buffered and a
+    background thread flushes and fsyncs them every `flush_interval` seconds, so one fsync covers
+    every change recorded in that window (pass sync=True to wait for it). After `snapshot_every`
+    changes the state is written out as a snapshot of just the entries needed to rebuild it, and
+    the journal segments it covers are deleted, so a restart replays the snapshot plus a short tail.
+
+    Files in `directory`: snapshot-<seq>.jsonl (a {"seq": n} header, then entries) and
+    journal-<first seq>.jsonl segments; every boot starts a new segment after any torn write.
+    A journal holds an exclusive lock on its directory until close(), so a second process pointed at
+    the same directory fails at startup instead of interleaving sequence numbers and deleting
+    segments the first still needs. If the flush thread fails, waiting writers get its error.
+    """
+
+    def __init__(self, directory, flush_interval=0.05, snapshot_every=10_000, sync_timeout=10):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.sync_timeout = sync_timeout
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, "lock"), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                raise RuntimeError(f"journal directory {directory!r} is in use by another process; "
+                                   "give each app process its own OAH_JOURNAL_DIR") from None
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._file = None
+        self._capture = None
+        self._stop = None
+        self.seq = 0  # Sequence number of the newest recorded change
+        self.synced_seq = 0
+        self.since_snapshot = 0
+        self.error = None  # Last flush or compaction failure
+        self.failures = 0
+
+    def _paths(self, prefix):
+        """(seq, path) for the snapshot or journal files, oldest first"""
+        paths = glob.glob(os.path.join(self.directory, f"{prefix}-*.jsonl"))
+        return sorted((int(os.path.basename(p)[len(prefix) + 1:-6]), p) for p in paths)
+
+    def recover(self):
+        """Yield (kind, data) for the latest snapshot, then every journal entry recorded after it"""
+        snapshots = self._paths("snapshot")
+        if snapshots:
+            lines = _read_lines(snapshots[-1][1])
+            self.seq = next(lines)["seq"]
+            for entry in lines:
+                yield entry["kind"], entry["data"]
+        for _, path in self._paths("journal"):
+            for entry in _read_lines(path):
+                if entry["seq"] > self.seq:
+                    self.seq = entry["seq"]
+                    self.since_snapshot += 1
+                    yield entry["kind"], entry["data"]
+        self.synced_seq = self.seq
+
+    def start(self, capture):
+        """Open a new segment and start the flush thread.
+
+        capture() is called with recording paused and must return an iterable of (kind, data)
+        that rebuilds the current state; it is consumed after recording resumes, so it should
+        read from a consistent view (e.g. SharedRecords.snapshot()) rather than live lists.
+        """
+        self._capture = capture
+        with self._lock:
+            self._open_segment()
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, name="oah-journal", daemon=True).start()
+        return self
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        path = os.path.join(self.directory, f"journal-{self.seq + 1:012d}.jsonl")
+        self._file = open(path, "ab")
+        _fsync_dir(self.directory)
+
+    def record(self, kind, data, apply=None, sync=False):
+        """Append one change; apply() runs under the journal lock so snapshots never see half of it"""
+        return self.record_many(kind, [data], apply, sync)
+
+    def record_many(self, kind, items, apply=None, sync=False):
+        """Append a batch of same-kind changes and apply() them together; returns the last seq"""
+        with self._lock:
+            # Encode first, so a change that can't be journaled is never applied either
+            lines = [_dumps({"seq": seq, "kind": kind, "data": data}) for seq, data in enumerate(items, self.seq + 1)]
+            if apply is not None:
+                apply()
+            self._file.writelines(lines)
+            self.seq += len(lines)
+            self.since_snapshot += len(lines)
+            seq = self.seq
+        if sync:
+            self.wait(seq, self.sync_timeout)
+        return seq
+
+    def wait(self, seq, timeout=None):
+        """Block until every change up to seq is on disk; raises the flush thread's error if a flush
+        fails in the meantime, or TimeoutError after timeout seconds"""
+        with self._synced:
+            failures = self.failures
+            done = self._synced.wait_for(lambda: self.synced_seq >= seq or self.failures > failures, timeout)
+            if self.synced_seq >= seq:
+                return
+            if not done:
+                raise TimeoutError(f"journal entry {seq} not on disk after {timeout}s")
+            raise self.error
+
+    def _sync(self):
+        # Caller holds the lock
+        if self.synced_seq < self.seq:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.synced_seq = self.seq
+            self._synced.notify_all()
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if self.since_snapshot >= self.snapshot_every:
+                    self.compact()
+            except Exception as exc:
+                # Keep the thread alive to retry next interval, but fail the writers waiting on it now
+                traceback.print_exc(file=sys.stderr)
+                with self._synced:
+                    self.error = exc
+                    self.failures += 1
+                    self._synced.notify_all()
+
+    def compact(self):
+        """Write a snapshot of the captured state and drop the journal segments it replaces"""
+        with self._lock:
+            self._open_segment()  # Everything up to seq is now in closed segments
+            seq, entries = self.seq, self._capture()
+            self.since_snapshot = 0
+        path = os.path.join(self.directory, f"snapshot-{seq:012d}.jsonl")
+        with open(path + ".tmp", "wb") as f:
+            f.write(_dumps({"seq": seq}))
+            for kind, data in entries:
+                f.write(_dumps({"kind": kind, "data": data}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        _fsync_dir(self.directory)
+        # Segments are named by their first seq, so every older one ends at or before seq
+        for first, old in self._paths("journal"):
+            if first <= seq:
+                os.unlink(old)
+        for snapshot_seq, old in self._paths("snapshot"):
+            if snapshot_seq < seq:
+                os.unlink(old)
+
+    def close(self):
+        if self._stop is not None:
+            self._stop.set()
+        with self._lock:
+            if self._file is not None:
+                with suppress(OSError):
+                    self._sync()
+                self._file.close()
+                self._file = None
+        self._lock_file.close()  # Releases the directory lock
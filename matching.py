@@ -0,0 +1,182 @@
+import dataclasses
+import heapq
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import NamedTuple
+import numpy as np
+from records import Request, to_epoch
+
+URGENCY_RANK = {"Low": 0, "Medium": 1, "High": 2, "Urgent": 3}
+# Seconds a request may wait, by urgency, before it counts as overdue
+URGENCY_SLA = {"Low": 72 * 3600, "Medium": 24 * 3600, "High": 8 * 3600, "Urgent": 2 * 3600}
+
+
+class Volunteer(NamedTuple):
+    name: str
+    skills: frozenset  # Request types this volunteer takes on
+    start_hour: int  # Available from start_hour up to (not including) end_hour
+    end_hour: int
+
+    def available_at(self, hour):
+        return hour is None or self.start_hour <= hour < self.end_hour
+
+
+def _hour(time_text):
+    """Hour of a request's preferred time ("08:30" / "08:30:00"), or None when it has none"""
+    return int(time_text[:2]) if time_text[:2].isdigit() else None
+
+
+def _queue_name(request, volunteers):
+    # Requests naming a known volunteer only go to that volunteer; "TBD" or a name nobody
+    # matches (the field is free text) leaves them with everyone who has the skill
+    return "@" + request.volunteer if request.volunteer in volunteers else request.type
+
+
+def _keys(requests, now):
+    """Heap keys (-urgency rank, deadline, ID); overdue requests are escalated one urgency level"""
+    ranks = np.array([URGENCY_RANK.get(r.urgency, 0) for r in requests], dtype=np.int64)
+    deadlines = np.array([r.created for r in requests], dtype=np.int64)
+    deadlines += np.array([URGENCY_SLA.get(r.urgency, URGENCY_SLA["Low"]) for r in requests], dtype=np.int64)
+    ranks += deadlines < now
+    return list(zip((-ranks).tolist(), deadlines.tolist(), [r.id for r in requests]))
+
+
+def _now():
+    # Same naive local clock as the Created strings
+    return to_epoch(datetime.now())
+
+
+class MatchingEngine:
+    """Matches open requests to volunteers by skill, availability and priority.
+
+    Pending requests sit in one heap per request type (plus one per volunteer for requests naming them
+    as the preferred volunteer), keyed by urgency then deadline. A volunteer's personalized queue is a
+    best-first walk over just the heaps of their skills, so reading the top k costs O(k log k)
+    and adding or accepting a request is O(log n). Accepted requests are dropped from the heaps
+    lazily; reoptimize() compacts them and re-escalates overdue requests.
+
+    Requests are held as compact Request records; the public methods take and return request dicts.
+    """
+
+    def __init__(self, volunteers):
+        self.volunteers = {v.name: v for v in volunteers}
+        self._by_skill = defaultdict(set)
+        for v in volunteers:
+            for skill in v.skills:
+                self._by_skill[skill].add(v.name)
+        self._heaps = defaultdict(list)
+        self._open = {}  # ID -> pending Request
+        self._assigned = defaultdict(dict)  # Volunteer -> {ID: Request}
+        self._lock = threading.Lock()
+        self._stop = None
+        self.version = 0
+
+    def load(self, df):
+        """Rebuild from a request DataFrame: Pending rows are queued, In Progress rows are assignments"""
+        records = Request.from_frame(df[df["Status"] == "Pending"])
+        heaps = defaultdict(list)
+        for key, request in zip(_keys(records, _now()), records):
+            heaps[_queue_name(request, self.volunteers)].append((key, request.id))
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        assigned = defaultdict(dict)
+        for request in Request.from_frame(df[df["Status"] == "In Progress"]):
+            if request.volunteer in self.volunteers:
+                assigned[request.volunteer][request.id] = request
+        with self._lock:
+            self._heaps, self._assigned = heaps, assigned
+            self._open = {r.id: r for r in records}
+            self.version += 1
+
+    def add(self, request):
+        """Queue a newly created request"""
+        if request["Status"] != "Pending":
+            return
+        request = Request.from_dict(request)
+        (key,) = _keys([request], _now())
+        with self._lock:
+            if request.id in self._open:  # Already picked up by load()
+                return
+            self._open[request.id] = request
+            heapq.heappush(self._heaps[_queue_name(request, self.volunteers)], (key, request.id))
+            self.version += 1
+
+    def is_candidate(self, name, request):
+        """Whether the named volunteer would see this request in their queue"""
+        volunteer = self.volunteers.get(name)
+        if volunteer is None:
+            return False
+        if request["Volunteer"] in self.volunteers:
+            return request["Volunteer"] == name
+        return name in self._by_skill[request["Type"]] and volunteer.available_at(_hour(request["Time"]))
+
+    def queue(self, name, limit=10, ids=None):
+        """Top `limit` open requests for a volunteer, optionally restricted to a set of IDs (search hits)"""
+        volunteer = self.volunteers.get(name)
+        if volunteer is None:
+            return []
+        matches = []
+        with self._lock:
+            heaps = [self._heaps[q] for q in [*volunteer.skills, "@" + name] if self._heaps.get(q)]
+            # Heap entries are only ordered parent-before-child, so expand children as parents are taken
+            frontier = [(heap[0], h, 0) for h, heap in enumerate(heaps)]
+            heapq.heapify(frontier)
+            while frontier and len(matches) < limit:
+                (_, request_id), h, i = heapq.heappop(frontier)
+                heap = heaps[h]
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], h, child))
+                request = self._open.get(request_id)
+                if request is None or (ids is not None and request_id not in ids):
+                    continue
+                if volunteer.available_at(_hour(request.time)):
+                    matches.append(request)
+        return [r.to_dict() for r in matches]
+
+    def accept(self, name, request_id):
+        """Assign an open request to a volunteer; returns it, or None if someone else got there first"""
+        with self._lock:
+            request = self._open.pop(request_id, None)
+            if request is None:
+                return None
+            request = dataclasses.replace(request, status="In Progress", volunteer=name)
+            self._assigned[name][request_id] = request
+            self.version += 1
+        return request.to_dict()
+
+    def assigned_to(self, name):
+        with self._lock:
+            return [r.to_dict() for r in self._assigned[name].values()]
+
+    @property
+    def open_count(self):
+        return len(self._open)
+
+    def reoptimize(self):
+        """Batch pass: drop accepted entries from the heaps and recompute keys so overdue requests escalate"""
+        with self._lock:
+            records = list(self._open.values())
+            heaps = defaultdict(list)
+            for key, request in zip(_keys(records, _now()), records):
+                heaps[_queue_name(request, self.volunteers)].append((key, request.id))
+            for heap in heaps.values():
+                heapq.heapify(heap)
+            self._heaps = heaps
+            self.version += 1
+
+    def start(self, interval=300):
+        """Run reoptimize() every `interval` seconds on a daemon thread"""
+        self._stop = threading.Event()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.reoptimize()
+
+        threading.Thread(target=loop, name="oah-matching", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
@@ -0,0 +1,113 @@
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from search import SearchIndex
+
+NOTIFICATION = "notification"
+READ = "notifications_read"
+CLEARED = "notifications_cleared"
+
+
+class NotificationStore:
+    """Per-user notification ring buffers with unread counters and search, persisted through a Journal.
+
+    Each user keeps their newest `capacity` notifications in a deque, so adding one is O(1) however
+    long they have been collecting. Changes are journaled and replayed with apply(), so notifications
+    and read state survive logouts and restarts and are shared by every session of the same user.
+    """
+
+    KINDS = (NOTIFICATION, READ, CLEARED)
+
+    def __init__(self, journal, capacity=200):
+        self.journal = journal
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._items = defaultdict(lambda: deque(maxlen=capacity))  # User -> notifications, oldest first
+        self._read = defaultdict(int)  # User -> id of the newest notification they have seen
+        self._unread = defaultdict(int)
+        self._indexes = defaultdict(lambda: SearchIndex(["msg"]))
+        self._last_id = 0  # Ids are store-wide and increasing, so "unread" is just id > read marker
+        self.version = 0
+
+    def apply(self, kind, data):
+        """Apply one journaled change (on replay, or under the journal lock when it is recorded)"""
+        user = data["user"]
+        with self._lock:
+            if kind == NOTIFICATION:
+                items = self._items[user]
+                if len(items) == items.maxlen:
+                    dropped = items[0]
+                    self._indexes[user].remove(dropped["id"])
+                    if dropped["id"] > self._read[user]:
+                        self._unread[user] -= 1
+                notif = {key: data[key] for key in ("id", "time", "msg", "type")}
+                items.append(notif)
+                self._indexes[user].add(notif["id"], notif)
+                if notif["id"] > self._read[user]:
+                    self._unread[user] += 1
+                self._last_id = max(self._last_id, notif["id"])
+            elif kind == READ:
+                self._read[user] = max(self._read[user], data["id"])
+                self._unread[user] = sum(1 for n in self._items[user] if n["id"] > self._read[user])
+                self._last_id = max(self._last_id, data["id"])
+            elif kind == CLEARED:
+                self._items[user].clear()
+                self._indexes[user].clear()
+                self._read[user] = self._last_id
+                self._unread[user] = 0
+            self.version += 1
+
+    def add(self, user, msg, type="info", time=None):
+        with self._lock:
+            self._last_id += 1
+            notif_id = self._last_id
+        notif = {
+            "user": user,
+            "id": notif_id,
+            "time": time or datetime.now().strftime('%H:%M:%S'),
+            "msg": msg,
+            "type": type,
+        }
+        self.journal.record(NOTIFICATION, notif, apply=lambda: self.apply(NOTIFICATION, notif))
+
+    def mark_read(self, user):
+        """Mark everything the user has so far as read; journaled only when it changes something"""
+        with self._lock:
+            # Concurrent adds can land slightly out of id order, so take the max rather than the last
+            newest = max((n["id"] for n in self._items.get(user, ())), default=0)
+            if newest <= self._read[user]:
+                return
+            data = {"user": user, "id": newest}
+        self.journal.record(READ, data, apply=lambda: self.apply(READ, data))
+
+    def clear(self, user):
+        data = {"user": user}
+        self.journal.record(CLEARED, data, apply=lambda: self.apply(CLEARED, data))
+
+    def count(self, user):
+        return len(self._items.get(user, ()))
+
+    def unread(self, user):
+        return self._unread.get(user, 0)
+
+    def page(self, user, offset=0, limit=20, ids=None):
+        """(newest-first notifications from offset, total), optionally only those whose id is in ids"""
+        with self._lock:
+            newest = [n for n in reversed(self._items.get(user, ())) if ids is None or n["id"] in ids]
+        return newest[offset:offset + limit], len(newest)
+
+    def search(self, user, query):
+        return self._indexes[user].search(query)
+
+    def entries(self):
+        """Journal entries that rebuild the current state; copies it now, for Journal snapshot captures"""
+        with self._lock:
+            state = [(user, list(items), self._read[user]) for user, items in self._items.items()]
+
+        def replay():
+            for user, items, read in state:
+                for notif in items:
+                    yield NOTIFICATION, {"user": user, **notif}
+                # Also carries the id sequence past a clear
+                yield READ, {"user": user, "id": read}
+        return replay()
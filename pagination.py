@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class KeysetPager:
+    """Keyset pagination over filtered, ordered views, with each view's row positions cached per filter signature.
+
+    Signatures are (table, data version, filters). load() returns (frame, positions): the frame is shared
+    by every view of one data version, so only the positions and their IDs are cached, and entries are
+    bounded by count and by those arrays' bytes, like FigureCache. Entries for an older version of a
+    table are dropped as soon as a newer one is cached, since nothing pages through them again.
+    """
+
+    def __init__(self, max_signatures=32, max_bytes=64 * 1024 * 1024):
+        self.max_signatures = max_signatures
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()  # Signature -> (frame, positions, ids, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _evict(self, signature):
+        self._bytes -= self._cache.pop(signature)[3]
+
+    def _view(self, signature, load, id_column):
+        with self._lock:
+            if signature in self._cache:
+                self._cache.move_to_end(signature)
+                return self._cache[signature]
+        # Miss: run the (possibly expensive) filter once
+        frame, positions = load()
+        positions = np.asarray(positions, dtype=np.int64)
+        ids = frame[id_column].to_numpy()[positions]
+        entry = (frame, positions, ids, positions.nbytes + ids.nbytes)
+        table, version = signature[:2]
+        with self._lock:
+            for stale in [s for s in self._cache if s[0] == table and s[1] != version]:
+                self._evict(stale)
+            if signature in self._cache:
+                self._evict(signature)
+            self._cache[signature] = entry
+            self._bytes += entry[3]
+            while len(self._cache) > 1 and (len(self._cache) > self.max_signatures or self._bytes > self.max_bytes):
+                self._evict(next(iter(self._cache)))
+        return entry
+
+    def page(self, signature, load, cursor=None, limit=25, id_column="ID"):
+        """Return (rows, next_cursor, total) for the page that starts after cursor.
+
+        The cursor is the ID of the last row shown, so the next page still starts right after it once
+        inserts have shifted positions; if that row has left the view, paging restarts from the top.
+        """
+        frame, positions, ids, _ = self._view(signature, load, id_column)
+        start = 0
+        if cursor is not None:
+            found = np.flatnonzero(ids == cursor)
+            start = int(found[0]) + 1 if len(found) else 0
+        end = min(start + limit, len(positions))
+        next_cursor = ids[end - 1] if end < len(positions) else None
+        return frame.iloc[positions[start:end]], next_cursor, len(positions)
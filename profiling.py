@@ -0,0 +1,19 @@
+import time
+
+
+class TimedContainer:
+    """Wraps a Streamlit container and adds the time spent rendering inside it to timings[name]"""
+
+    def __init__(self, container, name, timings):
+        self.container = container
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self):
+        self.container.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + time.perf_counter() - self._start
+        return self.container.__exit__(*exc)
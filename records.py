@@ -0,0 +1,130 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import numpy as np
+from store import REQUEST_COLUMNS
+
+# Timestamps are whole seconds since this epoch on the same naive local clock the UI formats
+EPOCH = datetime(1970, 1, 1)
+CREATED_FORMAT = "%Y-%m-%d %H:%M"
+DONATION_COLUMNS = ["Amount", "Donor", "Date", "Campaign"]
+# Low-cardinality request columns worth interning; free text (Description, Time) is left alone
+SHARED_COLUMNS = {"Type", "Urgency", "Status", "Volunteer", "Resident"}
+
+
+def to_epoch(value):
+    """Integer seconds for a datetime, pandas Timestamp or ISO string such as "2024-01-05 09:30" """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch(seconds):
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def to_paisa(rupees):
+    return round(rupees * 100)
+
+
+def to_rupees(paisa):
+    # Whole rupees stay ints so totals and labels read the same as before
+    return paisa // 100 if not paisa % 100 else paisa / 100
+
+
+def _interned(series):
+    """Column values with one shared string object per distinct value"""
+    if hasattr(series, "cat"):
+        categories = [sys.intern(str(c)) for c in series.cat.categories]
+        return [categories[code] for code in series.cat.codes.tolist()]
+    return [sys.intern(v) for v in series.astype(str).tolist()]
+
+
+@dataclass(slots=True)
+class Request:
+    """Compact service request: slots instead of a dict, shared category strings, epoch-second Created.
+
+    Fields follow REQUEST_COLUMNS; from_dict()/to_dict() convert to and from the UI's dict shape.
+    """
+    id: str
+    type: str
+    description: str
+    time: str
+    urgency: str
+    status: str
+    created: int
+    volunteer: str
+    resident: str
+
+    @classmethod
+    def from_dict(cls, request):
+        return cls(
+            str(request["ID"]),
+            sys.intern(str(request["Type"])),
+            str(request["Description"]),
+            str(request["Time"]),
+            sys.intern(str(request["Urgency"])),
+            sys.intern(str(request["Status"])),
+            to_epoch(request["Created"]),
+            sys.intern(str(request["Volunteer"])),
+            sys.intern(str(request["Resident"])),
+        )
+
+    @classmethod
+    def from_frame(cls, df):
+        """Records for every row of a request DataFrame, converted a column at a time"""
+        columns = []
+        for key in REQUEST_COLUMNS:
+            if key == "ID":
+                columns.append(df[key].astype(str).tolist())
+            elif key == "Created":
+                created = df[key].to_numpy(dtype=str).astype("datetime64[s]")
+                columns.append(created.astype(np.int64).tolist())
+            elif key in SHARED_COLUMNS:
+                columns.append(_interned(df[key]))
+            else:
+                columns.append(df[key].astype(str).tolist())
+        return [cls(*row) for row in zip(*columns)]
+
+    def to_dict(self):
+        return {
+            "ID": self.id,
+            "Type": self.type,
+            "Description": self.description,
+            "Time": self.time,
+            "Urgency": self.urgency,
+            "Status": self.status,
+            "Created": from_epoch(self.created).strftime(CREATED_FORMAT),
+            "Volunteer": self.volunteer,
+            "Resident": self.resident,
+        }
+
+
+@dataclass(slots=True)
+class Donation:
+    """Compact donation: integer paisa, epoch-second date and a shared campaign string"""
+    amount: int
+    donor: str
+    date: int
+    campaign: str
+
+    @classmethod
+    def from_dict(cls, donation):
+        return cls(
+            to_paisa(donation["Amount"]),
+            str(donation["Donor"]),
+            to_epoch(donation["Date"]),
+            sys.intern(str(donation["Campaign"])),
+        )
+
+    def as_row(self):
+        """[paisa, donor, epoch seconds, campaign]; Donation(*row) rebuilds it"""
+        return [self.amount, self.donor, self.date, self.campaign]
+
+    def to_dict(self):
+        return {
+            "Amount": to_rupees(self.amount),
+            "Donor": self.donor,
+            "Date": from_epoch(self.date),
+            "Campaign": self.campaign,
+        }
@@ -0,0 +1,168 @@
+import threading
+from array import array
+import numpy as np
+
+GRAM_SIZE = 3
+BUILD_CHUNK = 2_000  # Records indexed per lock hold by add_many()
+
+
+def _chars(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def _pack(chars):
+    """Trigram codes for every window of a code point array, 21 bits per character"""
+    return (chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:]
+
+
+def _short_code(chars):
+    """Code of a one- or two-character string: the character, or the pair packed like a gram's first two
+    (at least 2**21, so a pair never collides with a single character)"""
+    return int(chars[0]) if len(chars) == 1 else (int(chars[0]) << 21) | int(chars[1])
+
+
+def gram_codes(texts):
+    """(trigram code, index into texts) for every character of every text.
+
+    The gram at a character is it and the next two, NUL-padded past the end of the text, so texts
+    shorter than a trigram are indexed too and every substring starts some gram.
+    """
+    chars = _chars("\0\0".join(texts) + "\0\0")
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    owners = np.repeat(np.arange(len(texts)), lengths + 2)[:-2]
+    starts = chars[:-2] != 0  # Windows starting inside a separator belong to no text
+    return _pack(chars)[starts], owners[starts]
+
+
+class SearchIndex:
+    """Incrementally maintained trigram inverted index for case-insensitive substring search.
+
+    Records are numbered by position as they are added, and each trigram's postings are an int32
+    array of positions, appended in order so they stay sorted. Removing or re-adding a record leaves
+    a dead position behind that searches skip; the index is rebuilt once dead positions outnumber
+    live ones. Queries shorter than a trigram look up the grams starting with them in a prefix map
+    and union just those postings, so they cost in proportion to their matches, not the vocabulary.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self._keys = []  # Position -> key, None once removed
+        self._texts = []  # Position -> lowered field values, None once removed
+        self._positions = {}  # Key -> live position
+        self._grams = {}  # Trigram code -> array of positions
+        self._prefixes = {}  # One- or two-character code -> trigram codes starting with it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _unindex(self, key):
+        position = self._positions.pop(key, None)
+        if position is not None:
+            self._keys[position] = self._texts[position] = None
+
+    def _index(self, items):
+        """Index [(key, texts)]: one vectorized pass builds every record's distinct grams"""
+        owners = []
+        for key, texts in items:
+            self._unindex(key)
+            position = self._positions[key] = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(texts)
+            owners.append(position)
+        if not owners:
+            return
+        codes, text_owners = gram_codes([text for _, texts in items for text in texts])
+        positions = np.repeat(np.array(owners, dtype=np.int32), len(self.fields))[text_owners]
+        order = np.lexsort((positions, codes))
+        codes, positions = codes[order], positions[order]
+        distinct = np.r_[True, (codes[1:] != codes[:-1]) | (positions[1:] != positions[:-1])]
+        codes, positions = codes[distinct], positions[distinct]
+        bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+        grams = self._grams
+        for code, start, end in zip(codes[bounds[:-1]].tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+            postings = grams.get(code)
+            if postings is None:
+                postings = grams[code] = array("i")
+                self._prefixes.setdefault(code >> 42, []).append(code)
+                if (code >> 21) & 0x1FFFFF:  # Not NUL padding past the end of a text
+                    self._prefixes.setdefault(code >> 21, []).append(code)
+            postings.frombytes(positions[start:end].tobytes())
+
+    def _compact(self):
+        if len(self._keys) - len(self._positions) <= max(len(self._positions), 1024):
+            return
+        live = [(key, self._texts[position]) for key, position in self._positions.items()]
+        self._keys, self._texts, self._positions, self._grams, self._prefixes = [], [], {}, {}, {}
+        for start in range(0, len(live), BUILD_CHUNK):
+            self._index(live[start:start + BUILD_CHUNK])
+
+    def _texts_of(self, record):
+        return tuple(str(record.get(f, "")).lower().replace("\0", "") for f in self.fields)
+
+    def add(self, key, record):
+        """Index (or re-index) one record under key"""
+        self.add_many([(key, record)])
+
+    def add_many(self, items):
+        """Index an iterable of (key, record) pairs"""
+        batch = []
+        for key, record in items:
+            batch.append((key, self._texts_of(record)))
+            if len(batch) == BUILD_CHUNK:
+                with self._lock:
+                    self._index(batch)
+                batch = []
+        with self._lock:
+            self._index(batch)
+            self._compact()
+
+    def remove(self, key):
+        """Drop a record from the index"""
+        with self._lock:
+            self._unindex(key)
+            self._compact()
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._texts, self._positions, self._grams, self._prefixes = [], [], {}, {}, {}
+
+    def _candidates(self, needle):
+        """Sorted positions whose grams could contain needle"""
+        chars = _chars(needle)
+        if len(chars) < GRAM_SIZE:
+            # Every occurrence starts a gram; mark the positions of each gram starting with the needle
+            hits = np.zeros(len(self._keys), dtype=bool)
+            for code in self._prefixes.get(_short_code(chars), ()):
+                hits[np.array(self._grams[code], dtype=np.int32)] = True
+            return np.flatnonzero(hits)
+        postings = []
+        for code in np.unique(_pack(chars)).tolist():
+            if code not in self._grams:
+                return np.empty(0, dtype=np.int32)
+            postings.append(self._grams[code])
+        # Intersect smallest first; np.array copies, so no buffer stays exported on the growable arrays
+        postings.sort(key=len)
+        candidates = np.array(postings[0], dtype=np.int32)
+        for p in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, np.array(p, dtype=np.int32), assume_unique=True)
+        return candidates
+
+    def search(self, query, fields=None):
+        """Return the set of keys whose fields contain query (case-insensitive)"""
+        needle = query.lower().replace("\0", "")
+        if not needle:
+            return set(self._positions)
+        columns = [self.fields.index(f) for f in fields or self.fields]
+        with self._lock:
+            keys, texts = self._keys, self._texts
+            if len(needle) <= GRAM_SIZE and len(columns) == len(self.fields):
+                # A needle no longer than a gram is a gram (or starts one), so only dead positions need skipping
+                return {keys[p] for p in self._candidates(needle).tolist()} - {None}
+            # Grams can match in different fields or positions, and dead positions stay in the postings
+            return {
+                keys[p] for p in self._candidates(needle).tolist()
+                if texts[p] is not None and any(needle in texts[p][i] for i in columns)
+            }
@@ -0,0 +1,115 @@
+import threading
+from contextlib import contextmanager
+from search import SearchIndex
+
+
+class RWLock:
+    """Many concurrent readers or a single writer; waiting writers block new readers so they can't starve"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class Snapshot:
+    """Read-only view of the first `length` records of an append-only list.
+
+    Records are never changed or removed once appended, so a snapshot stays consistent while
+    writers keep appending; nothing is copied until a writer has to replace the list itself.
+    """
+
+    __slots__ = ("_records", "_length", "version")
+
+    def __init__(self, records, length, version):
+        self._records = records
+        self._length = length
+        self.version = version
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, seq):
+        if not 0 <= seq < self._length:
+            raise IndexError(seq)
+        return self._records[seq]
+
+    def seqs(self, hits=None):
+        """Arrival seqs newest first, optionally only those in hits (index hits newer than the snapshot are dropped)"""
+        if hits is None:
+            return range(self._length - 1, -1, -1)
+        return sorted((seq for seq in hits if seq < self._length), reverse=True)
+
+    def newest(self, hits=None):
+        return (self._records[seq] for seq in self.seqs(hits))
+
+
+class SharedRecords:
+    """Process-wide append-only records with a search index and running stats, shared by every session.
+
+    Keep one per process (st.cache_resource); sessions read through snapshot() and only hold on to
+    its version, instead of each carrying its own copy of the list. Records are appended as dicts,
+    which the index and stats see, and kept as compact record_type instances (see records.py);
+    snapshots hand those back, so convert with to_dict() where they reach the UI.
+    """
+
+    def __init__(self, index_fields, stats, record_type):
+        self._lock = RWLock()
+        self._records = []
+        self.record_type = record_type
+        self.index = SearchIndex(index_fields)  # Keyed by arrival seq
+        self.stats = stats
+        self.version = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def append(self, record):
+        """Add one record; returns its arrival seq"""
+        return self.extend([record])
+
+    def extend(self, records):
+        records = list(records)
+        compact = [self.record_type.from_dict(r) for r in records]
+        with self._lock.write():
+            start = len(self._records)
+            self._records.extend(compact)
+            self.index.add_many(enumerate(records, start))
+            for record in records:
+                self.stats.add(record)
+            self.version += 1
+            return len(self._records) - 1
+
+    def snapshot(self):
+        with self._lock.read():
+            return Snapshot(self._records, len(self._records), self.version)
@@ -0,0 +1,132 @@
+import itertools
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+_instance_ids = itertools.count()
+
+
+class RequestStats:
+    """Running request counters by status, urgency and type, updated in O(1) per insert"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.uid = next(_instance_ids)
+        self.version = 0  # Bumped on every insert; caches key derived data on (uid, version)
+        self.total = 0
+        self.by_status = Counter()
+        self.by_urgency = Counter()
+        self.by_type = Counter()
+
+    @classmethod
+    def from_store(cls, store):
+        """Seed the counters with one grouped query per field"""
+        stats = cls()
+        stats.by_status.update(store.count_by("Status"))
+        stats.by_urgency.update(store.count_by("Urgency"))
+        stats.by_type.update(store.count_by("Type"))
+        stats.total = sum(stats.by_status.values())
+        return stats
+
+    def add(self, request):
+        with self._lock:
+            self.total += 1
+            self.by_status[request["Status"]] += 1
+            self.by_urgency[request["Urgency"]] += 1
+            self.by_type[request["Type"]] += 1
+            self.version += 1
+
+    def update(self, before, after):
+        """Move a request between buckets when its status, urgency or type changes"""
+        with self._lock:
+            for counter, field in ((self.by_status, "Status"), (self.by_urgency, "Urgency"), (self.by_type, "Type")):
+                counter[before[field]] -= 1
+                counter[after[field]] += 1
+            self.version += 1
+
+    @property
+    def active(self):
+        return self.by_status["Pending"] + self.by_status["In Progress"]
+
+    @property
+    def fulfillment_rate(self):
+        return self.by_status["Completed"] / self.total if self.total else 0
+
+
+def _next_month(start):
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+# Rollup grain -> (bucket start for a timestamp, start of the following bucket)
+GRAINS = {
+    "hour": (lambda ts: datetime(ts.year, ts.month, ts.day, ts.hour), lambda start: start + timedelta(hours=1)),
+    "day": (lambda ts: datetime(ts.year, ts.month, ts.day), lambda start: start + timedelta(days=1)),
+    "month": (lambda ts: datetime(ts.year, ts.month, 1), _next_month),
+}
+
+
+class TimeRollup:
+    """Sums and counts per hour, day and month bucket, split by a key such as campaign, updated in O(1) per record"""
+
+    def __init__(self):
+        self._sums = {grain: defaultdict(Counter) for grain in GRAINS}
+        self._counts = {grain: defaultdict(Counter) for grain in GRAINS}
+        self._buckets = {}  # Hour bucket -> its bucket at every grain
+
+    def add(self, when, key, amount):
+        hour = GRAINS["hour"][0](when)
+        buckets = self._buckets.get(hour)
+        if buckets is None:
+            buckets = self._buckets[hour] = [(grain, floor(hour)) for grain, (floor, _) in GRAINS.items()]
+        for grain, bucket in buckets:
+            self._sums[grain][bucket][key] += amount
+            self._counts[grain][bucket][key] += 1
+
+    def series(self, grain, start, end):
+        """(bucket, {key: sum}, {key: count}) for every bucket from start's up to end, empty ones included.
+
+        Costs one lookup per bucket, however many records fell into them.
+        """
+        floor, step = GRAINS[grain]
+        sums, counts = self._sums[grain], self._counts[grain]
+        rows = []
+        bucket = floor(start)
+        while bucket < end:
+            rows.append((bucket, dict(sums.get(bucket, {})), dict(counts.get(bucket, {}))))
+            bucket = step(bucket)
+        return rows
+
+
+class DonationStats:
+    """Running donation totals per campaign and per hour/day/month bucket, plus count, max and average"""
+
+    def __init__(self, donations=()):
+        self._lock = threading.Lock()
+        self.uid = next(_instance_ids)
+        self.version = 0
+        self.total = 0
+        self.count = 0
+        self.largest = 0
+        self.by_campaign = Counter()
+        self.rollups = TimeRollup()
+        for donation in donations:
+            self.add(donation)
+
+    def add(self, donation):
+        amount = donation["Amount"]
+        with self._lock:
+            self.total += amount
+            self.count += 1
+            self.largest = max(self.largest, amount)
+            self.by_campaign[donation["Campaign"]] += amount
+            self.rollups.add(donation["Date"], donation["Campaign"], amount)
+            self.version += 1
+
+    def series(self, grain, start, end):
+        """Per-campaign sums and counts from the rollups; see TimeRollup.series"""
+        with self._lock:
+            return self.rollups.series(grain, start, end)
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0
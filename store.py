@@ -0,0 +1,191 @@
+import sqlite3
+import threading
+from collections import deque
+from ids import WORKERS
+
+# Maps the request dict keys used by the UI to their SQLite columns
+REQUEST_COLUMNS = {
+    "ID": "id",
+    "Type": "type",
+    "Description": "description",
+    "Time": "time",
+    "Urgency": "urgency",
+    "Status": "status",
+    "Created": "created",
+    "Volunteer": "volunteer",
+    "Resident": "resident",
+}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS requests (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        description TEXT NOT NULL,
+        time TEXT NOT NULL,
+        urgency TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created TEXT NOT NULL,
+        volunteer TEXT NOT NULL,
+        resident TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status);
+    CREATE INDEX IF NOT EXISTS idx_requests_urgency ON requests(urgency);
+    CREATE INDEX IF NOT EXISTS idx_requests_resident ON requests(resident);
+    CREATE INDEX IF NOT EXISTS idx_requests_type ON requests(type);
+    CREATE INDEX IF NOT EXISTS idx_requests_created ON requests(created);
+    CREATE TABLE IF NOT EXISTS id_workers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        claimed TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+ORDERINGS = {
+    "newest": "created DESC, id DESC",
+    "oldest": "created ASC, id ASC",
+    "inserted": "rowid DESC",
+}
+
+UPDATE_LOG = 10_000  # Updates remembered for updated_since(); older readers rebuild from scratch
+
+
+class RequestStore:
+    """SQLite-backed service request repository shared by all sessions"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.version = 0  # Bumped on every write so derived caches know when to rebuild
+        self._updates = deque()  # (version, request id) per update, oldest first
+        self._forgotten = 0  # Newest version dropped from _updates
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        # One connection per Streamlit script thread; WAL lets readers run alongside the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _where(filters, search=None, search_fields=()):
+        clauses, params = [], []
+        for key, value in filters.items():
+            if value is None or value == "All":
+                continue
+            clauses.append(f"{REQUEST_COLUMNS[key]} = ?")
+            params.append(value)
+        if search:
+            like = " OR ".join(f"{REQUEST_COLUMNS[f]} LIKE ?" for f in search_fields)
+            clauses.append(f"({like})")
+            params.extend([f"%{search}%"] * len(search_fields))
+        sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return sql, params
+
+    @staticmethod
+    def _to_dict(row):
+        return dict(zip(REQUEST_COLUMNS, row))
+
+    def insert(self, request):
+        """Insert a single request dict"""
+        self.insert_many([request])
+
+    def insert_many(self, requests):
+        """Bulk insert request dicts in one transaction"""
+        self.insert_rows(tuple(r[k] for k in REQUEST_COLUMNS) for r in requests)
+
+    def insert_rows(self, rows):
+        """Bulk insert row tuples already in REQUEST_COLUMNS order"""
+        cols = ", ".join(REQUEST_COLUMNS.values())
+        marks = ", ".join("?" * len(REQUEST_COLUMNS))
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.executemany(f"INSERT INTO requests ({cols}) VALUES ({marks})", rows)
+            self.version += 1
+
+    def claim_worker(self):
+        """A worker number for ids.TimeOrderedIds, handed out round-robin to every process (and bulk load) sharing this database"""
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                worker = conn.execute("INSERT INTO id_workers DEFAULT VALUES").lastrowid
+        return worker % WORKERS
+
+    def update(self, request_id, **fields):
+        """Set fields (UI keys, e.g. Status="Completed") on one request"""
+        sets = ", ".join(f"{REQUEST_COLUMNS[key]} = ?" for key in fields)
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute(f"UPDATE requests SET {sets} WHERE id = ?", [*fields.values(), request_id])
+            self.version += 1
+            self._updates.append((self.version, request_id))
+            if len(self._updates) > UPDATE_LOG:
+                self._forgotten = self._updates.popleft()[0]
+
+    def updated_since(self, version):
+        """IDs of requests updated after version, or None if that is further back than the update log goes"""
+        with self._write_lock:
+            if version < self._forgotten:
+                return None
+            return {request_id for v, request_id in self._updates if v > version}
+
+    def count(self, search=None, search_fields=(), **filters):
+        """Count requests matching equality filters such as Status="Pending" """
+        where, params = self._where(filters, search, search_fields)
+        return self._conn().execute(f"SELECT COUNT(*) FROM requests{where}", params).fetchone()[0]
+
+    def count_by(self, field):
+        """Return {value: count} grouped on an indexed column"""
+        col = REQUEST_COLUMNS[field]
+        rows = self._conn().execute(f"SELECT {col}, COUNT(*) FROM requests GROUP BY {col}")
+        return dict(rows.fetchall())
+
+    def distinct(self, field):
+        """Return the sorted distinct values of a column"""
+        col = REQUEST_COLUMNS[field]
+        rows = self._conn().execute(f"SELECT DISTINCT {col} FROM requests ORDER BY {col}")
+        return [r[0] for r in rows.fetchall()]
+
+    def iter_chunks(self, chunk_size=5000, order="inserted", **filters):
+        """Yield matching requests as lists of row tuples, chunk_size rows at a time"""
+        where, params = self._where(filters)
+        cursor = self._conn().execute(
+            f"SELECT {', '.join(REQUEST_COLUMNS.values())} FROM requests{where} ORDER BY {ORDERINGS[order]}", params
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+    def rows_after(self, rowid):
+        """(last rowid, row tuples in REQUEST_COLUMNS order) for requests inserted after rowid"""
+        rows = self._conn().execute(
+            f"SELECT rowid, {', '.join(REQUEST_COLUMNS.values())} FROM requests WHERE rowid > ? ORDER BY rowid", (rowid,)
+        ).fetchall()
+        return (rows[-1][0] if rows else rowid), [row[1:] for row in rows]
+
+    def rows_for(self, ids, chunk_size=500):
+        """Row tuples in REQUEST_COLUMNS order for the given request IDs"""
+        ids, rows = list(ids), []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            rows.extend(self._conn().execute(
+                f"SELECT {', '.join(REQUEST_COLUMNS.values())} FROM requests WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return rows
+
+    def query(self, order="inserted", limit=None, search=None, search_fields=(), **filters):
+        """Return matching requests as dicts, using the column indexes for filtering"""
+        where, params = self._where(filters, search, search_fields)
+        sql = f"SELECT {', '.join(REQUEST_COLUMNS.values())} FROM requests{where} ORDER BY {ORDERINGS[order]}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._to_dict(r) for r in self._conn().execute(sql, params).fetchall()]
@@ -0,0 +1,237 @@
+"""Seeded, vectorized synthetic data for demos and load testing.
+
+Usage:
+    python synthetic.py --requests 1000000 --db oah_connect.db
+    python synthetic.py --requests 1000000 --donations 1000000 --parquet-dir load_data/
+    python synthetic.py --products 5000 --catalog catalog.csv
+"""
+import argparse
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from dateutil import tz
+from ids import ids_for_times
+from store import REQUEST_COLUMNS, RequestStore
+
+SERVICE_TYPES = [
+    "🚶 Morning Walk", "🛒 Grocery Shopping", "👨‍⚕️ Doctor Visit",
+    "🏠 Home Help", "💊 Medicine Pickup", "📞 Phone Call",
+    "🧹 Cleaning Help", "🍳 Cooking Assistance", "📖 Reading Companion"
+]
+SERVICE_WEIGHTS = [0.18, 0.16, 0.14, 0.1, 0.14, 0.1, 0.06, 0.06, 0.06]
+RESIDENTS = ["Mrs. Sharma", "Mr. Gupta", "Mrs. Patel", "Mr. Singh", "Ms. Kapoor",
+             "Mr. Rao", "Mrs. Khan", "Mr. Verma", "Ms. Joshi", "Mrs. Mehta"]
+VOLUNTEERS = ["Rahul Kumar", "Priya Sharma", "Amit Patel", "Sneha Singh",
+              "Vikram Reddy", "Anjali Gupta", "Rohan Das", "TBD"]
+STATUSES = ["Pending", "In Progress", "Completed", "Cancelled"]
+STATUS_WEIGHTS = [0.3, 0.2, 0.42, 0.08]
+URGENCIES = ["Low", "Medium", "High", "Urgent"]
+URGENCY_WEIGHTS = [0.4, 0.35, 0.18, 0.07]
+DONORS = [
+    "Rajesh Kumar", "Priya Sharma", "Anonymous", "Amit Patel", "Sneha Gupta",
+    "Vikram Industries", "Rahul Verma", "Anjali Singh", "Tech Corp",
+    "Rohan Das", "Kavita Reddy", "Sunita Joshi", "Ramesh & Family",
+    "Neha Kapoor", "Arjun Mehta", "Senior Care Foundation"
+]
+CAMPAIGNS = ["Winter Care", "Medical Fund", "General Support", "Food Program"]
+CAMPAIGN_WEIGHTS = [0.45, 0.25, 0.2, 0.1]
+AMOUNTS = [100, 200, 500, 1000, 1500, 2000, 2500, 5000, 10000]
+AMOUNT_WEIGHTS = [0.12, 0.16, 0.22, 0.2, 0.1, 0.09, 0.05, 0.04, 0.02]
+# Category -> (SKU prefix, base items with a typical price); suppliers sell each in several brands and packs
+PRODUCT_LINES = {
+    "🏥 Healthcare": ("HC", [("Adult Diapers", 899), ("Blood Pressure Monitor", 1299), ("Walking Stick", 499),
+                            ("Medicine Organizer", 299), ("Paracetamol 500mg", 35), ("Knee Support", 349)]),
+    "🍎 Groceries": ("GR", [("Fresh Fruits", 120), ("Milk", 60), ("Whole Wheat Bread", 45), ("Eggs", 84),
+                           ("Basmati Rice", 180), ("Oats", 150)]),
+    "📚 Leisure": ("LE", [("Large Print Books", 299), ("Puzzle Games", 199), ("Reading Glasses", 499)]),
+}
+BRANDS = ["CarePlus", "Apollo", "DailyFresh", "SilverAge", "Himalaya", "Amul", "Comfort", "NatureBest"]
+PACKS = [("", 1.0), (" (Pack of 2)", 1.9), (" (Pack of 5)", 4.5), (" (Family Size)", 2.6)]
+
+NOTIFICATION_TEMPLATES = [
+    ("Volunteer {volunteer} accepted a request from {resident}", "success"),
+    ("Donation received from {donor}", "success"),
+    ("Reminder: {service} for {resident}", "warning"),
+    ("{service} request completed for {resident}", "success"),
+    ("New {service} request from {resident}", "info"),
+]
+
+# Relative activity by hour of day: quiet overnight, morning and late-afternoon peaks
+DIURNAL = np.array([1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 12, 10, 8, 8, 9, 11, 12, 10, 7, 5, 4, 3, 2, 1], dtype=float)
+DIURNAL /= DIURNAL.sum()
+
+
+def _weights(weights):
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+def _pick(rng, values, n, weights=None):
+    """Vectorized random.choice returning a categorical column"""
+    codes = rng.choice(len(values), size=n, p=None if weights is None else _weights(weights))
+    return pd.Categorical.from_codes(codes, categories=values)
+
+
+def _timestamps(rng, n, now, days=30):
+    """Timestamps over the last `days` days following the diurnal activity curve"""
+    today = pd.Timestamp(now).normalize()
+    offsets = (
+        -pd.to_timedelta(rng.integers(0, days + 1, n), unit="D")
+        + pd.to_timedelta(rng.choice(24, size=n, p=DIURNAL), unit="h")
+        + pd.to_timedelta(rng.integers(0, 3600, n), unit="s")
+    )
+    stamps = today + offsets
+    # Keep everything in the past
+    return stamps.where(stamps <= pd.Timestamp(now), stamps - pd.Timedelta(days=1))
+
+
+def _minute_strings(stamps):
+    """'%Y-%m-%d %H:%M' strings without the per-row cost of strftime"""
+    return np.char.replace(np.datetime_as_string(stamps.to_numpy().astype("datetime64[m]")), "T", " ")
+
+
+def _epoch_ms(stamps):
+    """UTC epoch milliseconds for naive local-time stamps, the clock live ids are taken from"""
+    local = pd.Series(stamps).dt.tz_localize(
+        tz.tzlocal(), ambiguous=np.zeros(len(stamps), dtype=bool), nonexistent="shift_forward"
+    )
+    return local.dt.tz_convert(None).to_numpy().astype("datetime64[ms]").astype(np.int64)
+
+
+def requests_frame(n, rng, worker=0, now=None):
+    """n service requests with skewed service types, an urgency mix and diurnal creation times.
+
+    IDs are time-ordered like live ones (see ids.py), from each request's creation time and `worker`.
+    """
+    now = now or datetime.now()
+    stamps = _timestamps(rng, n, now)
+    slots = [f"{h:02d}:{m}" for h in range(8, 19) for m in ("00", "15", "30", "45")]
+    return pd.DataFrame({
+        "ID": ids_for_times(_epoch_ms(stamps), worker),
+        "Type": _pick(rng, SERVICE_TYPES, n, SERVICE_WEIGHTS),
+        "Description": "Request for assistance with daily activities. Special requirements noted.",
+        "Time": _pick(rng, slots, n),
+        "Urgency": _pick(rng, URGENCIES, n, URGENCY_WEIGHTS),
+        "Status": _pick(rng, STATUSES, n, STATUS_WEIGHTS),
+        "Created": _minute_strings(stamps),
+        "Volunteer": _pick(rng, VOLUNTEERS, n),
+        "Resident": _pick(rng, RESIDENTS, n),
+    })
+
+
+def donations_frame(n, rng, now=None):
+    """n donations, newest first, skewed towards the main campaign and small gifts"""
+    now = now or datetime.now()
+    df = pd.DataFrame({
+        "Amount": np.asarray(AMOUNTS)[rng.choice(len(AMOUNTS), size=n, p=_weights(AMOUNT_WEIGHTS))],
+        "Donor": _pick(rng, DONORS, n),
+        "Date": _timestamps(rng, n, now),
+        "Campaign": _pick(rng, CAMPAIGNS, n, CAMPAIGN_WEIGHTS),
+    })
+    return df.sort_values("Date", ascending=False, ignore_index=True)
+
+
+def products_frame(n, rng):
+    """n catalog products (catalog.CATALOG_COLUMNS, no images) with brand, pack size and price spread"""
+    lines = [(category, prefix, item, price) for category, (prefix, items) in PRODUCT_LINES.items()
+             for item, price in items]
+    line = rng.integers(0, len(lines), n)
+    brand = rng.integers(0, len(BRANDS), n)
+    pack = rng.integers(0, len(PACKS), n)
+    spread = rng.uniform(0.8, 1.25, n)
+    return pd.DataFrame({
+        "SKU": [f"{lines[l][1]}-{i + 1:06d}" for i, l in enumerate(line)],
+        "Name": [f"{BRANDS[b]} {lines[l][2]}{PACKS[p][0]}" for l, b, p in zip(line, brand, pack)],
+        "Category": [lines[l][0] for l in line],
+        "Price": [max(int(lines[l][3] * PACKS[p][1] * x), 10) for l, p, x in zip(line, pack, spread)],
+        "Image": "",
+    }).sort_values(["Category", "SKU"], ignore_index=True)
+
+
+def notifications_frame(n, rng, now=None):
+    """n notifications rendered from templates, newest first"""
+    now = now or datetime.now()
+    template = rng.integers(0, len(NOTIFICATION_TEMPLATES), n)
+    fill = {
+        "volunteer": np.asarray(VOLUNTEERS)[rng.integers(0, len(VOLUNTEERS), n)],
+        "resident": np.asarray(RESIDENTS)[rng.integers(0, len(RESIDENTS), n)],
+        "donor": np.asarray(DONORS)[rng.integers(0, len(DONORS), n)],
+        "service": np.asarray(SERVICE_TYPES)[rng.integers(0, len(SERVICE_TYPES), n)],
+    }
+    msgs = [NOTIFICATION_TEMPLATES[t][0].format(**{k: v[i] for k, v in fill.items()}) for i, t in enumerate(template)]
+    stamps = _timestamps(rng, n, now, days=1).sort_values(ascending=False)
+    return pd.DataFrame({
+        "time": stamps.strftime("%H:%M"),
+        "msg": msgs,
+        "type": [NOTIFICATION_TEMPLATES[t][1] for t in template],
+    })
+
+
+def write_requests(store, n, seed=None, chunk_size=100_000):
+    """Append n synthetic requests to a RequestStore, chunk_size rows per transaction"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_size):
+        # A worker number per chunk keeps IDs unique across chunks and alongside running app processes
+        chunk = requests_frame(min(chunk_size, n - start), rng, worker=store.claim_worker())
+        store.insert_rows(chunk[list(REQUEST_COLUMNS)].astype(str).itertuples(index=False, name=None))
+
+
+def donation_records(n, seed=None):
+    """n synthetic donations as a newest-first list of dicts"""
+    df = donations_frame(n, np.random.default_rng(seed))
+    df["Donor"] = df["Donor"].astype(str)
+    df["Campaign"] = df["Campaign"].astype(str)
+    return df.to_dict("records")
+
+
+def notification_records(n, seed=None):
+    """n synthetic notifications as oldest-first (time, msg, type) tuples, for NotificationStore.add"""
+    df = notifications_frame(n, np.random.default_rng(seed))
+    return list(zip(df["time"].tolist(), df["msg"].tolist(), df["type"].tolist()))[::-1]
+
+
+def write_parquet(directory, requests=0, donations=0, seed=None, chunk_size=100_000):
+    """Write synthetic requests/donations as chunked Parquet part files under directory"""
+    rng = np.random.default_rng(seed)
+    for name, total, build in (
+        ("requests", requests, lambda size, start: requests_frame(size, rng, worker=start // chunk_size)),
+        ("donations", donations, lambda size, start: donations_frame(size, rng)),
+    ):
+        if not total:
+            continue
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+        for part, start in enumerate(range(0, total, chunk_size)):
+            chunk = build(min(chunk_size, total - start), start)
+            chunk.to_parquet(os.path.join(directory, name, f"part-{part:05d}.parquet"), index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=0)
+    parser.add_argument("--donations", type=int, default=0)
+    parser.add_argument("--products", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--db", help="SQLite request store to append requests to")
+    parser.add_argument("--parquet-dir", help="write Parquet part files here instead")
+    parser.add_argument("--catalog", help="write --products catalog products to this CSV (OAH_CATALOG_PATH)")
+    args = parser.parse_args(argv)
+
+    if args.catalog:
+        products_frame(args.products, np.random.default_rng(args.seed)).to_csv(args.catalog, index=False)
+        if not (args.requests or args.donations):
+            return
+
+    if args.parquet_dir:
+        write_parquet(args.parquet_dir, args.requests, args.donations, args.seed, args.chunk_size)
+    elif args.db:
+        if args.donations:
+            parser.error("donations are held in memory by the app process, so --donations needs --parquet-dir")
+        write_requests(RequestStore(args.db), args.requests, args.seed, args.chunk_size)
+    else:
+        parser.error("pass --db or --parquet-dir")
+
+
+if __name__ == "__main__":
+    main()
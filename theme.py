@@ -0,0 +1,295 @@
+import functools
+import re
+
+
+def _minify(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+
+@functools.lru_cache(maxsize=32)
+def stylesheet(font_size):
+    """Return the app's minified <style> block for a font size, built once per size and reused on every rerun"""
+    return f"<style>{_minify(_css(font_size))}</style>"
+
+
+def _css(font_size):
+    return f"""
+    /* Inter from the local system, falling back to the platform UI font (no network fetch) */
+    @font-face {{
+        font-family: 'Inter';
+        src: local('Inter'), local('Inter Regular'), local('Inter-Regular');
+        font-display: swap;
+    }}
+    
+    /* Main Background - Subtle Light Gradient */
+    .main {{
+        background: linear-gradient(135deg, #f5f7fa 0%, #e9ecef 25%, #f8f9fa 50%, #e3e9f0 75%, #f0f4f8 100%);
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    }}
+    
+    /* Block Container - Solid White Background */
+    .block-container {{
+        background: rgba(255, 255, 255, 0.98);
+        border-radius: 20px;
+        padding: 2rem 3rem !important;
+        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
+    }}
+    
+    /* Sidebar - Solid Gradient with Good Contrast */
+    [data-testid="stSidebar"] {{
+        background: linear-gradient(180deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
+    }}
+    
+    [data-testid="stSidebar"] > div:first-child {{
+        background: transparent;
+    }}
+    
+    /* All Sidebar Text - White and Bold */
+    [data-testid="stSidebar"] * {{
+        color: white !important;
+    }}
+    
+    [data-testid="stSidebar"] label {{
+        color: white !important;
+        font-weight: 600 !important;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
+    }}
+    
+    [data-testid="stSidebar"] .stMarkdown {{
+        color: white !important;
+    }}
+    
+    /* Headers - Dark and Clear */
+    h1 {{
+        font-size: {font_size * 2.2}px !important;
+        color: #1a1a1a !important;
+        font-weight: 800 !important;
+        text-align: center;
+        margin-bottom: 0.5rem !important;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.05);
+    }}
+    
+    h2 {{
+        font-size: {font_size * 1.7}px !important;
+        color: #2d3748 !important;
+        font-weight: 700 !important;
+        margin-top: 1.5rem !important;
+        margin-bottom: 1rem !important;
+    }}
+    
+    h3 {{
+        font-size: {font_size * 1.4}px !important;
+        color: #4a5568 !important;
+        font-weight: 600 !important;
+    }}
+    
+    /* All Body Text - Dark and Readable */
+    p, div, span, label, li {{
+        color: #2d3748 !important;
+        font-size: {font_size}px !important;
+        line-height: 1.6 !important;
+    }}
+    
+    /* Card Container Style - Solid Background */
+    .card {{
+        background: white;
+        border-radius: 16px;
+        padding: 2rem;
+        margin: 1rem 0;
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+        border: 1px solid #e2e8f0;
+        transition: all 0.3s ease;
+    }}
+    
+    .card:hover {{
+        transform: translateY(-4px);
+        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.15);
+    }}
+    
+    /* Enhanced Buttons with Better Visibility */
+    .stButton > button {{
+        font-size: {font_size * 1.1}px !important;
+        padding: 0.75rem 2rem !important;
+        border-radius: 12px !important;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+        color: white !important;
+        border: none !important;
+        font-weight: 700 !important;
+        transition: all 0.3s ease !important;
+        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4) !important;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }}
+    
+    .stButton > button:hover {{
+        transform: translateY(-2px);
+        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6) !important;
+    }}
+    
+    /* Metric Cards - White Background with Dark Text */
+    [data-testid="stMetricValue"] {{
+        font-size: {font_size * 2.2}px !important;
+        color: #1a1a1a !important;
+        font-weight: 800 !important;
+    }}
+    
+    [data-testid="stMetricLabel"] {{
+        font-size: {font_size * 1}px !important;
+        color: #4a5568 !important;
+        font-weight: 600 !important;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }}
+    
+    [data-testid="stMetricDelta"] {{
+        color: #2d3748 !important;
+        font-weight: 600 !important;
+    }}
+    
+    [data-testid="metric-container"] {{
+        background: white;
+        padding: 1.5rem !important;
+        border-radius: 12px;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        border-left: 4px solid #667eea;
+        transition: all 0.3s ease;
+    }}
+    
+    [data-testid="metric-container"]:hover {{
+        transform: scale(1.03);
+        box-shadow: 0 4px 16px rgba(0,0,0,0.12);
+    }}
+    
+    /* Enhanced Input Fields - White Background */
+    .stTextInput > div > div > input,
+    .stSelectbox > div > div > select,
+    .stTextArea > div > div > textarea,
+    .stNumberInput > div > div > input {{
+        font-size: {font_size}px !important;
+        border-radius: 10px !important;
+        border: 2px solid #cbd5e0 !important;
+        padding: 0.75rem !important;
+        background: white !important;
+        color: #2d3748 !important;
+        font-weight: 500 !important;
+        transition: all 0.3s ease !important;
+    }}
+    
+    .stTextInput > div > div > input:focus,
+    .stSelectbox > div > div > select:focus,
+    .stTextArea > div > div > textarea:focus {{
+        border-color: #667eea !important;
+        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.2) !important;
+    }}
+    
+    /* Input Labels - Dark and Bold */
+    .stTextInput label,
+    .stSelectbox label,
+    .stTextArea label,
+    .stNumberInput label,
+    .stDateInput label,
+    .stTimeInput label {{
+        color: #2d3748 !important;
+        font-weight: 600 !important;
+        font-size: {font_size * 1.05}px !important;
+    }}
+    
+    /* Tabs - Better Visibility */
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 8px;
+        background: #f7fafc;
+        border-radius: 12px;
+        padding: 0.5rem;
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        font-size: {font_size * 1.1}px !important;
+        padding: 0.75rem 1.5rem !important;
+        border-radius: 8px !important;
+        font-weight: 600 !important;
+        color: #4a5568 !important;
+        transition: all 0.3s ease !important;
+    }}
+    
+    .stTabs [data-baseweb="tab"]:hover {{
+        background: #e2e8f0;
+        color: #2d3748 !important;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+        color: white !important;
+    }}
+    
+    /* Progress Bar */
+    .stProgress > div > div > div > div {{
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 50%, #f093fb 100%) !important;
+    }}
+    
+    .stProgress > div > div {{
+        background-color: #e2e8f0 !important;
+    }}
+    
+    /* DataFrames - White Background with Dark Text */
+    [data-testid="stDataFrame"] {{
+        border-radius: 12px !important;
+        overflow: hidden !important;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08) !important;
+        background: white !important;
+    }}
+    
+    [data-testid="stDataFrame"] table {{
+        color: #2d3748 !important;
+    }}
+    
+    [data-testid="stDataFrame"] th {{
+        background: #f7fafc !important;
+        color: #1a1a1a !important;
+        font-weight: 700 !important;
+    }}
+    
+    /* Alert Boxes - Better Contrast */
+    .stAlert {{
+        border-radius: 12px !important;
+        border: none !important;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08) !important;
+        background: white !important;
+        color: #2d3748 !important;
+        border-left: 4px solid #667eea !important;
+    }}
+    
+    /* Expander */
+    .streamlit-expanderHeader {{
+        background: #f7fafc !important;
+        border-radius: 10px !important;
+        font-weight: 600 !important;
+        color: #2d3748 !important;
+        border: 1px solid #e2e8f0 !important;
+    }}
+    
+    .streamlit-expanderHeader:hover {{
+        background: #edf2f7 !important;
+    }}
+    
+    /* Slider */
+    .stSlider > div > div > div {{
+        color: #2d3748 !important;
+        font-weight: 600 !important;
+    }}
+    
+    /* Radio Buttons */
+    [data-testid="stRadio"] label {{
+        color: #2d3748 !important;
+        font-weight: 600 !important;
+    }}
+    
+    /* Form borders */
+    [data-testid="stForm"] {{
+        background: white;
+        border: 2px solid #e2e8f0 !important;
+        border-radius: 12px;
+        padding: 1.5rem;
+    }}
+"""